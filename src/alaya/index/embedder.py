@@ -41,6 +41,19 @@ def get_model():
     return _model, cfg
 
 
+def warmup() -> None:
+    """Load the embedding model ahead of the first search or ingest.
+
+    Meant to run in a background thread at server startup. Failures (e.g. the
+    model cannot be downloaded) are logged and left for the first real call
+    to surface.
+    """
+    try:
+        get_model()
+    except Exception as e:
+        logger.warning("Embedding model warmup failed: %s", e)
+
+
 def reset_model() -> None:
     """Clear the cached model. Intended for use in tests only."""
     global _model, _loaded_model_key, _embed_query_cache_key, _embed_query_cached
@@ -166,26 +166,26 @@ def upsert_note(
     if not chunks:
         return
 
-    # Check if the table has the embedding_model column (absent on old schemas)
-    has_model_col = "embedding_model" in {f.name for f in table.schema}
-
-    rows = []
-    for chunk, embedding in zip(chunks, embeddings):
-        row = {
-            "path": chunk.path,
-            "title": chunk.title,
-            "directory": chunk.directory,
-            "tags": "," + ",".join(chunk.tags) + "," if chunk.tags else "",
-            "modified_date": chunk.modified_date,
-            "chunk_index": chunk.chunk_index,
-            "text": chunk.text,
-            "vector": embedding.tolist(),
-        }
-        if has_model_col:
-            row["embedding_model"] = active_model
-        rows.append(row)
-
-    table.add(rows)
+    # Build the batch column-wise: one pyarrow Table and a single add() call.
+    # Vectors go in as one contiguous float32 buffer instead of a Python list
+    # of floats per chunk.
+    vectors = np.stack(embeddings).astype(np.float32, copy=False)
+    columns = {
+        "path": [c.path for c in chunks],
+        "title": [c.title for c in chunks],
+        "directory": [c.directory for c in chunks],
+        "tags": ["," + ",".join(c.tags) + "," if c.tags else "" for c in chunks],
+        "modified_date": [c.modified_date for c in chunks],
+        "chunk_index": [c.chunk_index for c in chunks],
+        "text": [c.text for c in chunks],
+        "vector": pa.FixedSizeListArray.from_arrays(pa.array(vectors.ravel()), vectors.shape[1]),
+    }
+    # The embedding_model column is absent on old schemas
+    if "embedding_model" in table.schema.names:
+        columns["embedding_model"] = [active_model] * len(chunks)
+
+    schema = pa.schema([table.schema.field(name) for name in columns])
+    table.add(pa.Table.from_pydict(columns, schema=schema))
 
 
 def delete_note_from_index(path: str, store: VaultStore) -> None:
@@ -197,6 +197,15 @@ def delete_note_from_index(path: str, store: VaultStore) -> None:
         logger.warning("Failed to delete %s from index: %s", path, e)
 
 
+def count_note_chunks(path: str, store: VaultStore) -> int:
+    """Return the number of chunks indexed for `path`, or 0 if the index can't be read."""
+    try:
+        return store._get_table().count_rows(f"path = '{_sq(path)}'")
+    except _STORE_ERRORS as e:
+        logger.warning("Failed to count chunks for %s: %s", path, e)
+        return 0
+
+
 def update_metadata(
     old_path: str,
     new_path: str,
@@ -194,6 +194,14 @@ def _maybe_start_reembed(vault_root, store) -> None:
     t.start()
 
 
+def _start_embedder_warmup() -> None:
+    """Load the embedding model in the background so the first tool call doesn't pay for it."""
+    import threading
+    from alaya.index.embedder import warmup
+
+    threading.Thread(target=warmup, daemon=True, name="alaya-embedder-warmup").start()
+
+
 def main() -> None:
     try:
         vault_root = get_vault_root()
@@ -242,6 +250,7 @@ def main() -> None:
     logger.info("File watcher started")
 
     _maybe_start_reembed(vault_root, store)
+    _start_embedder_warmup()
 
     try:
         mcp.run()
@@ -0,0 +1,147 @@
+"""Content-addressable cache for expensive ingest steps (URL fetch, PDF extraction).
+
+Values are stored as zlib-compressed JSON blobs named by the hex digest of
+their key. A small SQLite index tracks blob size and last access time so the
+cache can be trimmed least-recently-used first once it exceeds _MAX_BYTES.
+
+The cache is an optimisation only: any I/O or SQLite failure is logged and
+the producer is called directly, so a broken cache never breaks ingest.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+_INDEX_NAME = "index.sqlite3"
+_BLOB_SUFFIX = ".json.z"
+_MAX_BYTES = 256 * 1024 * 1024
+
+_CACHE_ERRORS = (OSError, sqlite3.Error, zlib.error, ValueError)
+
+# sqlite3 connections are not safe for concurrent use, so every access to a
+# cached connection happens under _lock.
+_lock = threading.Lock()
+_connections: dict[Path, sqlite3.Connection] = {}
+
+
+def _connect(cache_dir: Path) -> sqlite3.Connection:
+    """Return the index connection for cache_dir, creating it once. Caller must hold _lock."""
+    conn = _connections.get(cache_dir)
+    if conn is None:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(cache_dir / _INDEX_NAME, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, size INTEGER NOT NULL, "
+            "created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        _connections[cache_dir] = conn
+    return conn
+
+
+def _lookup(cache_dir: Path, name: str, max_age: float | None) -> tuple[bool, Any]:
+    """Return (hit, value) for a cache entry, refreshing its access time on a hit."""
+    now = time.time()
+    with _lock:
+        conn = _connect(cache_dir)
+        row = conn.execute("SELECT created FROM entries WHERE key = ?", (name,)).fetchone()
+    if row is None or (max_age is not None and now - row[0] > max_age):
+        return False, None
+    # Read the blob without holding _lock so concurrent lookups don't queue
+    # behind each other's disk reads. If eviction removes the blob in the
+    # meantime, the FileNotFoundError is handled as a cache failure.
+    blob = (cache_dir / f"{name}{_BLOB_SUFFIX}").read_bytes()
+    with _lock:
+        conn = _connect(cache_dir)
+        with conn:
+            conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, name))
+    return True, json.loads(zlib.decompress(blob))
+
+
+def _store(cache_dir: Path, name: str, value: Any) -> None:
+    """Write a blob atomically, record it in the index, and trim the cache if needed."""
+    blob = zlib.compress(json.dumps(value).encode("utf-8"))
+    now = time.time()
+    with _lock:
+        conn = _connect(cache_dir)
+        fd, tmp_name = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(blob)
+            os.replace(tmp_name, cache_dir / f"{name}{_BLOB_SUFFIX}")
+        except Exception:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, size, created, accessed) VALUES (?, ?, ?, ?)",
+                (name, len(blob), now, now),
+            )
+        _evict(conn, cache_dir)
+
+
+def _evict(conn: sqlite3.Connection, cache_dir: Path) -> None:
+    """Delete least-recently-used entries until the cache fits in _MAX_BYTES. Caller must hold _lock."""
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+    if total <= _MAX_BYTES:
+        return
+    doomed = []
+    for name, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed"):
+        if total <= _MAX_BYTES:
+            break
+        doomed.append(name)
+        total -= size
+    with conn:
+        conn.executemany("DELETE FROM entries WHERE key = ?", [(n,) for n in doomed])
+    for name in doomed:
+        (cache_dir / f"{name}{_BLOB_SUFFIX}").unlink(missing_ok=True)
+
+
+def get_or_compute(
+    key: bytes,
+    producer: Callable[[], Any],
+    cache_dir: Path,
+    max_age: float | None = None,
+) -> Any:
+    """Return the cached value for key, or call producer() and cache its result.
+
+    key is a digest (e.g. SHA-256) identifying the input. The producer's
+    return value must be JSON-serialisable; tuples come back as lists.
+    max_age (seconds) expires entries whose content may change upstream,
+    such as URLs. Exceptions from producer() propagate and are not cached.
+    """
+    name = key.hex()
+    try:
+        hit, value = _lookup(cache_dir, name, max_age)
+        if hit:
+            return value
+    except _CACHE_ERRORS as e:
+        logger.debug("Ingest cache read failed for %s: %s", name, e)
+
+    value = producer()
+
+    try:
+        _store(cache_dir, name, value)
+    except _CACHE_ERRORS as e:
+        logger.debug("Ingest cache write failed for %s: %s", name, e)
+    return value
+
+
+def reset_cache() -> None:
+    """Close all cached index connections. Intended for use in tests only."""
+    with _lock:
+        for conn in _connections.values():
+            conn.close()
+        _connections.clear()
@@ -1,7 +1,17 @@
 """Ingest tool: PDF, URL, and markdown file ingestion into LanceDB."""
 from __future__ import annotations
 
+import functools
+import hashlib
 import ipaddress
+import json
+import multiprocessing
+import os
+import random
+import socket
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import date
 from pathlib import Path
@@ -9,6 +19,8 @@ from urllib.parse import urlparse
 
 from fastmcp import FastMCP
 from alaya.config import get_vault_root
+from alaya.tools._ingest_cache import get_or_compute
+from alaya.tools._locks import atomic_write
 
 _INGESTIBLE_SUFFIXES = {".pdf", ".md", ".txt"}
 _ALLOWED_SCHEMES = frozenset({"http", "https"})
@@ -22,6 +34,31 @@ _BLOCKED_HOSTNAMES = frozenset({
 })
 
 
+def _is_blocked_ip(addr: ipaddress.IPv4Address | ipaddress.IPv6Address) -> bool:
+    return addr.is_private or addr.is_loopback or addr.is_link_local or addr.is_reserved
+
+
+# How long a DNS answer used for the SSRF check may be reused. Kept short:
+# httpx resolves the host again when it connects, so a long-lived cached answer
+# would keep approving a host after it is re-pointed at an internal address.
+_DNS_CACHE_TTL = 30
+
+
+@functools.lru_cache(maxsize=1024)
+def _resolve_host_cached(hostname: str, ttl_bucket: int) -> tuple[str, ...]:
+    resolved = socket.getaddrinfo(hostname, None, type=socket.SOCK_STREAM)
+    return tuple(dict.fromkeys(sockaddr[0] for _, _, _, _, sockaddr in resolved))
+
+
+def _resolve_host(hostname: str) -> tuple[str, ...]:
+    """Resolve a hostname to its IP address strings, reusing answers for up to _DNS_CACHE_TTL seconds.
+
+    Batches of URLs usually share a handful of hosts, so this saves a DNS
+    round-trip per URL. Resolution failures raise and are therefore not cached.
+    """
+    return _resolve_host_cached(hostname, int(time.monotonic() // _DNS_CACHE_TTL))
+
+
 def _validate_url(url: str) -> None:
     """Reject non-HTTP schemes and private/loopback/link-local IP destinations.
 
@@ -45,28 +82,39 @@ def _validate_url(url: str) -> None:
         raise ValueError(f"Blocked internal hostname: {hostname}")
 
     # Block private/loopback/link-local IP addresses
-    import socket
     try:
         addr = ipaddress.ip_address(hostname)
     except ValueError:
         # hostname is a DNS name — resolve it and check the IP
         try:
-            resolved = socket.getaddrinfo(hostname, None, type=socket.SOCK_STREAM)
-            for family, _, _, _, sockaddr in resolved:
-                addr = ipaddress.ip_address(sockaddr[0])
-                if addr.is_private or addr.is_loopback or addr.is_link_local or addr.is_reserved:
-                    raise ValueError(f"Blocked private/internal IP address: {hostname} resolves to {addr}")
+            resolved = _resolve_host(lower_host)
         except socket.gaierror:
-            pass  # DNS resolution failed — let httpx handle the error
+            return  # DNS resolution failed — let httpx handle the error
+        for ip in resolved:
+            addr = ipaddress.ip_address(ip)
+            if _is_blocked_ip(addr):
+                raise ValueError(f"Blocked private/internal IP address: {hostname} resolves to {addr}")
         return
 
-    if addr.is_private or addr.is_loopback or addr.is_link_local or addr.is_reserved:
+    if _is_blocked_ip(addr):
         raise ValueError(f"Blocked private/internal IP address: {hostname}")
+
+
 # Minimum extracted characters before a PDF is considered scanned.
 # 250 chars is conservative (~2 short sentences) and avoids false-positives
 # on sparse-but-valid PDFs like slide decks or cover pages.
 _SCANNED_PDF_MIN_CHARS = 250
 
+# Fetched pages can change upstream, so URL cache entries expire after a day.
+# PDF entries are keyed on file content and never go stale.
+_URL_CACHE_MAX_AGE = 24 * 60 * 60
+
+# Responses with these media types are ingested as-is, skipping HTML extraction.
+_PLAIN_TEXT_CONTENT_TYPES = frozenset({"text/plain", "text/markdown", "text/x-markdown"})
+
+# Upper bound on concurrent URL fetches during batch_ingest.
+_MAX_CONCURRENT_FETCHES = 8
+
 
 @dataclass
 class IngestResult:
@@ -77,36 +125,75 @@ class IngestResult:
     suggested_links: list[dict] = field(default_factory=list)
 
 
-def _fetch_url(url: str, _retries: int = 3, _backoff: float = 1.0) -> tuple[str, str]:
-    """Fetch a URL and return (title, html_content).
+# Shared HTTP client so repeated and batched fetches reuse keep-alive
+# connections instead of paying a TCP/TLS handshake per URL.
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def _get_http_client():
+    """Return the shared httpx.Client, creating it once (thread-safe)."""
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                import httpx
+                _http_client = httpx.Client(
+                    timeout=30,
+                    follow_redirects=True,
+                    limits=httpx.Limits(
+                        max_keepalive_connections=_MAX_CONCURRENT_FETCHES,
+                        keepalive_expiry=60,
+                    ),
+                )
+    return _http_client
+
+
+def reset_http_client() -> None:
+    """Close and clear the shared HTTP client. Intended for use in tests only."""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is not None:
+            _http_client.close()
+        _http_client = None
+
+
+def _fetch_url(url: str, _retries: int = 3, _backoff: float = 1.0) -> tuple[str, str, str]:
+    """Fetch a URL and return (title, body, content_type).
+
+    content_type is the lowercased media type without parameters
+    (e.g. "text/html"), or "" when the server sends none.
 
     Validates the URL before fetching and after any redirect to block SSRF.
-    Retries up to _retries times with exponential backoff on transient errors
-    (network failures and 5xx / 429 responses). 4xx client errors are not
-    retried — they indicate a deterministic failure.
+    Retries up to _retries times with full-jitter exponential backoff (a
+    random delay in [0, _backoff * 2**attempt]) on transient errors (network
+    failures and 5xx / 429 responses), so concurrent fetches against a flaky
+    host do not retry in lockstep. 4xx client errors are not retried — they
+    indicate a deterministic failure.
     """
-    import time
     import httpx
 
     _validate_url(url)
+    client = _get_http_client()
 
     last_exc: Exception | None = None
     for attempt in range(_retries):
         try:
-            response = httpx.get(url, timeout=30, follow_redirects=True)
+            response = client.get(url)
             # validate the final URL after any redirects
             _validate_url(str(response.url))
             if response.status_code in {429, 500, 502, 503, 504} and attempt < _retries - 1:
-                time.sleep(_backoff * (2 ** attempt))
+                time.sleep(random.uniform(0, _backoff * (2 ** attempt)))
                 continue
             response.raise_for_status()
             # naive title extraction — trafilatura does the real work
             title = url.split("/")[-1] or url
-            return title, response.text
+            content_type = response.headers.get("content-type", "").partition(";")[0].strip().lower()
+            return title, response.text, content_type
         except httpx.TransportError as exc:
             last_exc = exc
             if attempt < _retries - 1:
-                time.sleep(_backoff * (2 ** attempt))
+                time.sleep(random.uniform(0, _backoff * (2 ** attempt)))
 
     raise last_exc or httpx.HTTPError(f"Failed to fetch {url} after {_retries} attempts")
 
@@ -118,10 +205,96 @@ def _extract_text_from_html(html: str, url: str = "") -> str:
     return text or ""
 
 
+# Each extraction worker handles at least this many pages. Below that, spawning
+# a process (which re-imports pymupdf4llm and reopens the file) costs more than
+# it saves, so short PDFs are extracted in-process. Spawning a worker costs
+# about 2s, roughly 7-10 pages of extraction; at 32 pages that start-up is
+# around a fifth of each worker's run.
+_PDF_PAGES_PER_WORKER = 32
+
+
+def _pdf_page_batches(page_count: int, workers: int) -> list[list[int]]:
+    """Split page indices into `workers` contiguous, ordered, near-equal batches."""
+    size, extra = divmod(page_count, workers)
+    batches = []
+    start = 0
+    for i in range(workers):
+        end = start + size + (1 if i < extra else 0)
+        batches.append(list(range(start, end)))
+        start = end
+    return batches
+
+
+def _extract_pdf_pages(path: str, pages: list[int]) -> str:
+    """Extract markdown for a subset of pages. Module-level so worker processes can unpickle it."""
+    import pymupdf4llm
+    return pymupdf4llm.to_markdown(path, pages=pages)
+
+
 def _extract_pdf(path: str) -> str:
-    """Extract markdown from a PDF using pymupdf4llm."""
+    """Extract markdown from a PDF using pymupdf4llm.
+
+    Long PDFs are split into contiguous page ranges extracted in parallel
+    worker processes (parsing is CPU-bound) and reassembled in page order.
+    """
+    import pymupdf
     import pymupdf4llm
-    return pymupdf4llm.to_markdown(path)
+
+    with pymupdf.open(path) as doc:
+        page_count = doc.page_count
+    workers = min(os.cpu_count() or 1, page_count // _PDF_PAGES_PER_WORKER)
+    if workers <= 1:
+        return pymupdf4llm.to_markdown(path)
+
+    batches = _pdf_page_batches(page_count, workers)
+    # spawn rather than fork: the server process is multi-threaded
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return "".join(pool.map(_extract_pdf_pages, [path] * workers, batches))
+
+
+def _cache_dir(vault: Path) -> Path:
+    """Return the ingest cache directory, kept alongside the vector index."""
+    from alaya.index.store import get_store
+    return get_store(vault).db_path.parent / "ingest_cache"
+
+
+def _cache_key(kind: str, payload: bytes) -> bytes:
+    """Namespace a cache key so URL and file digests can never collide."""
+    return hashlib.sha256(kind.encode() + b"\0" + payload).digest()
+
+
+def _normalize_url(url: str) -> str:
+    """Lowercase scheme and host and drop the fragment, which is never sent to the server."""
+    parsed = urlparse(url)
+    return parsed._replace(scheme=parsed.scheme.lower(), netloc=parsed.netloc.lower(), fragment="").geturl()
+
+
+def _cached_fetch_url(url: str, vault: Path) -> tuple[str, str, str]:
+    """_fetch_url, served from the ingest cache when the URL was fetched recently."""
+    key = _cache_key("url:v2", _normalize_url(url).encode())
+    title, body, content_type = get_or_compute(
+        key, lambda: _fetch_url(url), _cache_dir(vault), max_age=_URL_CACHE_MAX_AGE
+    )
+    return title, body, content_type
+
+
+def _hash_file(path: Path) -> bytes:
+    """SHA-256 of a file, streamed in fixed-size reads so large PDFs are never held in memory."""
+    with path.open("rb") as f:
+        return hashlib.file_digest(f, "sha256").digest()
+
+
+def _cached_extract_pdf(path: Path, vault: Path) -> str:
+    """_extract_pdf, served from the ingest cache when the same PDF bytes were seen before."""
+    key = _cache_key("pdf", _hash_file(path))
+    return get_or_compute(key, lambda: _extract_pdf(str(path)), _cache_dir(vault))
+
+
+def _index_path(path: str, vault: Path) -> str:
+    """Return the index path for an ingest source: vault-relative for files inside the vault."""
+    if path.startswith("/") and path.startswith(str(vault)):
+        return str(Path(path).relative_to(vault))
+    return path
 
 
 def _index_content(
@@ -142,7 +315,7 @@ def _index_content(
         synthetic += f"{tag_line}\n\n"
     synthetic += text
 
-    rel = path if not path.startswith("/") else str(Path(path).relative_to(vault)) if path.startswith(str(vault)) else path
+    rel = _index_path(path, vault)
     chunks = chunk_note(rel, synthetic)
     if not chunks:
         return 0
@@ -153,6 +326,119 @@ def _index_content(
     return len(chunks)
 
 
+# Serialises read-modify-write of ingest_state.json across batch workers.
+_ingest_state_lock = threading.Lock()
+
+# Parsed ingest_state.json per state file, keyed on the file's (mtime_ns, size)
+# so unchanged state isn't re-read and re-parsed on every ingest. Guarded by
+# _ingest_state_lock.
+_ingest_state_cache: dict[Path, tuple[tuple[int, int], dict]] = {}
+
+
+def _ingest_state_path(vault: Path) -> Path:
+    """Return the ingest fingerprint state file, kept alongside the vector index."""
+    return _cache_dir(vault).parent / "ingest_state.json"
+
+
+def _state_stamp(state_file: Path) -> tuple[int, int] | None:
+    try:
+        st = state_file.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _load_ingest_state(state_file: Path) -> dict:
+    """Return the ingest state for state_file. Caller must hold _ingest_state_lock and must not mutate it."""
+    stamp = _state_stamp(state_file)
+    if stamp is None:
+        return {}
+    cached = _ingest_state_cache.get(state_file)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    try:
+        state = json.loads(state_file.read_text())
+    except (OSError, ValueError):
+        state = {}
+    _ingest_state_cache[state_file] = (stamp, state)
+    return state
+
+
+def _save_ingest_state(state_file: Path, state: dict) -> None:
+    """Write state, dropping entries for source files that no longer exist. Caller must hold _ingest_state_lock."""
+    state = {
+        source: entry for source, entry in state.items()
+        if "file" not in entry or Path(entry["file"]).exists()
+    }
+    state_file.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write(state_file, json.dumps(state, indent=2))
+    stamp = _state_stamp(state_file)
+    if stamp is not None:
+        _ingest_state_cache[state_file] = (stamp, state)
+
+
+def reset_ingest_state_cache() -> None:
+    """Forget parsed ingest state. Intended for use in tests only."""
+    with _ingest_state_lock:
+        _ingest_state_cache.clear()
+
+
+def _source_fingerprint(path: Path | None, text: str) -> str:
+    """Cheap change marker: mtime and size for files, a content digest for URLs."""
+    if path is not None:
+        st = path.stat()
+        return f"{st.st_mtime_ns}:{st.st_size}"
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _index_if_changed(
+    source: str,
+    title: str,
+    tags: list[str],
+    text: str,
+    vault: Path,
+    source_path: Path | None,
+) -> int:
+    """_index_content, skipped when this source was already indexed unchanged.
+
+    A source counts as unchanged when its fingerprint, title, tags and the
+    active embedding model all match the last successful ingest and the
+    index still holds that many chunks for it, in which case the stored
+    chunk count is returned without re-chunking or embedding. The row check
+    catches chunks removed behind the state file's back: reindex_all pruning
+    non-vault paths, a schema-mismatch table rebuild, or delete_note_from_index.
+    """
+    from alaya.index.models import get_active_model
+    from alaya.index.store import count_note_chunks, get_store
+
+    record = {
+        "fingerprint": _source_fingerprint(source_path, text),
+        "title": title,
+        "tags": tags,
+        "model": get_active_model().key,
+    }
+    state_file = _ingest_state_path(vault)
+    with _ingest_state_lock:
+        prev = _load_ingest_state(state_file).get(source)
+    if (
+        prev
+        and all(prev.get(k) == v for k, v in record.items())
+        and count_note_chunks(_index_path(source, vault), get_store(vault)) == prev["chunks_indexed"]
+    ):
+        return prev["chunks_indexed"]
+
+    chunks_indexed = _index_content(source, title, tags, text, vault)
+
+    entry = {**record, "chunks_indexed": chunks_indexed}
+    if source_path is not None:
+        entry["file"] = str(source_path)
+    with _ingest_state_lock:
+        state = dict(_load_ingest_state(state_file))
+        state[source] = entry
+        _save_ingest_state(state_file, state)
+    return chunks_indexed
+
+
 def _find_suggested_links(text: str, vault: Path, limit: int = 5) -> list[dict]:
     """Find top semantically related existing notes for suggested wikilinks."""
     try:
@@ -182,13 +468,17 @@ def ingest(
 
     tags = tags or []
     raw_text = ""
+    source_path: Path | None = None
     resolved_title = title or source.split("/")[-1]
 
     # --- URL ---
     if source.startswith("http://") or source.startswith("https://"):
-        fetched_title, html = _fetch_url(source)
+        fetched_title, body, content_type = _cached_fetch_url(source, vault)
         resolved_title = title or fetched_title
-        raw_text = _extract_text_from_html(html, url=source)
+        if content_type in _PLAIN_TEXT_CONTENT_TYPES:
+            raw_text = body  # already readable text — nothing for trafilatura to strip
+        else:
+            raw_text = _extract_text_from_html(body, url=source)
 
     # --- file path ---
     else:
@@ -209,11 +499,12 @@ def ingest(
                 chunks_indexed=0,
             )
 
+        source_path = path
         suffix = path.suffix.lower()
         resolved_title = title or path.stem
 
         if suffix == ".pdf":
-            raw_text = _extract_pdf(str(path))
+            raw_text = _cached_extract_pdf(path, vault)
             extracted_chars = len(raw_text.strip())
             if extracted_chars < _SCANNED_PDF_MIN_CHARS:
                 return IngestResult(
@@ -243,7 +534,7 @@ def ingest(
             chunks_indexed=0,
         )
 
-    chunks_indexed = _index_content(source, resolved_title, tags, raw_text, vault)
+    chunks_indexed = _index_if_changed(source, resolved_title, tags, raw_text, vault, source_path)
     suggested_links = _find_suggested_links(raw_text, vault)
 
     return IngestResult(
@@ -255,6 +546,27 @@ def ingest(
     )
 
 
+def _prefetch_urls(urls: list[str], vault: Path) -> dict[str, Exception]:
+    """Fetch URLs concurrently into the ingest cache. Returns {url: exception} for failures.
+
+    Only the network-bound fetch overlaps; extraction and indexing stay
+    sequential in batch_ingest. Successful fetches are picked up from the
+    cache by the subsequent ingest() call.
+    """
+    unique = list(dict.fromkeys(u for u in urls if u.startswith(("http://", "https://"))))
+    if len(unique) < 2:
+        return {}
+
+    failures: dict[str, Exception] = {}
+    with ThreadPoolExecutor(max_workers=min(_MAX_CONCURRENT_FETCHES, len(unique))) as pool:
+        futures = {url: pool.submit(_cached_fetch_url, url, vault) for url in unique}
+        for url, future in futures.items():
+            exc = future.exception()
+            if exc is not None:
+                failures[url] = exc
+    return failures
+
+
 def batch_ingest(
     sources: list[str],
     tags: list[str],
@@ -262,6 +574,9 @@ def batch_ingest(
 ) -> str:
     """Ingest multiple sources in one call. Per-source errors are reported but do not abort the batch.
 
+    URLs are fetched concurrently up front; a URL whose fetch failed is
+    reported without being retried a second time.
+
     Returns a summary string with per-source status and aggregate totals.
     """
     lines = []
@@ -269,8 +584,12 @@ def batch_ingest(
     failed = 0
     total_chunks = 0
 
+    fetch_failures = _prefetch_urls(sources, vault)
+
     for source in sources:
         try:
+            if source in fetch_failures:
+                raise fetch_failures[source]
             result = ingest(source, tags=tags, vault=vault)
             lines.append(f"OK  [{result.chunks_indexed} chunks] {result.title} ({source})")
             succeeded += 1
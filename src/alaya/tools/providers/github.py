@@ -12,6 +12,10 @@ class GitHubError(Exception):
     pass
 
 
+_REPO_RE = re.compile(r"github\.com/([^/]+/[^/]+)/issues")
+_ISSUE_RE = re.compile(r"/issues/(\d+)")
+
+
 def _run_gh(args: list[str], timeout: int = 30) -> str:
     try:
         result = subprocess.run(["gh"] + args, capture_output=True, text=True, timeout=timeout)
@@ -27,14 +31,14 @@ def _run_gh(args: list[str], timeout: int = 30) -> str:
 
 def _repo_from_url(url: str) -> str:
     """Extract 'org/repo' from a GitHub issue URL."""
-    match = re.search(r"github\.com/([^/]+/[^/]+)/issues", url)
+    match = _REPO_RE.search(url)
     if not match:
         raise GitHubError(f"Cannot parse repo from URL: {url}")
     return match.group(1)
 
 
 def _issue_number_from_url(url: str) -> int:
-    match = re.search(r"/issues/(\d+)", url)
+    match = _ISSUE_RE.search(url)
     if not match:
         raise GitHubError(f"Cannot parse issue number from URL: {url}")
     return int(match.group(1))
@@ -1,4 +1,5 @@
 """Read tools: get_note, list_notes, get_backlinks, get_links, get_tags, reindex_vault."""
+from datetime import date, timedelta
 from pathlib import Path
 
 from fastmcp import FastMCP
@@ -111,8 +112,6 @@ def list_notes(
     When backend is provided, delegates to backend.list_notes().
     Otherwise falls back to zk CLI for backward compatibility.
     """
-    from datetime import date, timedelta
-
     if since and recent is not None:
         raise ValueError("since and recent are exclusive -- use one or the other, not both")
 
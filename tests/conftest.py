@@ -3,6 +3,9 @@ from pathlib import Path
 
 import pytest
 
+# Give assertions in shared helpers pytest's detailed failure output.
+pytest.register_assert_rewrite("tests.unit.tools._helpers")
+
 
 VAULT_FIXTURE_PATH = Path(__file__).parent.parent / "vault_fixture"
 VAULT_FIXTURE_LARGE_PATH = Path(__file__).parent.parent / "vault_fixture_large"
@@ -16,6 +19,27 @@ def vault(tmp_path: Path) -> Path:
     return vault_path
 
 
+@pytest.fixture
+def vault_rw(tmp_path: Path) -> Path:
+    """A private, writable vault copy for tests in modules that share a read-only vault."""
+    vault_path = tmp_path / "notes_rw"
+    shutil.copytree(VAULT_FIXTURE_PATH, vault_path)
+    return vault_path
+
+
+@pytest.fixture(scope="session")
+def shared_vault(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """One copy of vault_fixture for the whole session.
+
+    Modules whose tests never write to the vault opt in by overriding
+    ``vault`` to return this fixture; tests there that do write use
+    ``vault_rw`` instead.
+    """
+    vault_path = tmp_path_factory.mktemp("shared_vault") / "notes"
+    shutil.copytree(VAULT_FIXTURE_PATH, vault_path)
+    return vault_path
+
+
 @pytest.fixture(autouse=True)
 def set_vault_env(vault: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     """Set ZK_NOTEBOOK_DIR to the temp vault for every test."""
@@ -148,3 +148,16 @@ class TestGetModelThreadSafety:
             reset_model()
             get_model()
             assert mock_cls.call_count == 2
+
+    def test_warmup_loads_model(self):
+        from alaya.index.embedder import get_model, warmup
+        with patch("fastembed.TextEmbedding", return_value=MagicMock()) as mock_cls:
+            warmup()
+            get_model()
+        assert mock_cls.call_count == 1
+
+    def test_warmup_logs_load_failure(self, caplog):
+        from alaya.index.embedder import warmup
+        with patch("fastembed.TextEmbedding", side_effect=OSError("offline")):
+            warmup()  # must not raise
+        assert "warmup failed" in caplog.text
@@ -6,7 +6,7 @@ import numpy as np
 import pytest
 
 from alaya.index.embedder import Chunk, chunk_note
-from alaya.index.store import upsert_note, delete_note_from_index, hybrid_search, VaultStore, get_store, reset_store, _sq, _sq_like
+from alaya.index.store import upsert_note, delete_note_from_index, count_note_chunks, hybrid_search, VaultStore, get_store, reset_store, _sq, _sq_like
 
 
 def _make_chunks(path: str, text: str = "Some content about kubernetes and helm.") -> list[Chunk]:
@@ -52,6 +52,22 @@ class TestUpsertNote:
             upsert_note(path, chunks, _fake_embeddings(chunks), store)
         assert store.count() == 2
 
+    def test_multi_chunk_batch_round_trips(self, tmp_path: Path) -> None:
+        store = VaultStore(tmp_path / "lance")
+        chunks = [
+            Chunk(path="projects/big.md", title="big", tags=["a", "b"] if i % 2 else [],
+                  directory="projects", modified_date="2026-02-01", chunk_index=i, text=f"chunk {i}")
+            for i in range(5)
+        ]
+        embeddings = _fake_embeddings(chunks)
+        upsert_note("projects/big.md", chunks, embeddings, store)
+
+        rows = sorted(store._get_table().search().limit(10).to_list(), key=lambda r: r["chunk_index"])
+        assert [r["chunk_index"] for r in rows] == list(range(5))
+        assert rows[1]["tags"] == ",a,b,"
+        assert rows[0]["tags"] == ""
+        np.testing.assert_array_equal(np.asarray(rows[3]["vector"], dtype=np.float32), embeddings[3])
+
 
 class TestDeleteNoteFromIndex:
     def test_removes_chunks_for_path(self, tmp_path: Path) -> None:
@@ -80,6 +96,23 @@ class TestDeleteNoteFromIndex:
         assert store.count() == 0
 
 
+class TestCountNoteChunks:
+    def test_counts_only_rows_for_path(self, tmp_path: Path) -> None:
+        store = VaultStore(tmp_path / "lance")
+        for path in ["ideas/it's-complicated.md", "resources/kubernetes-notes.md"]:
+            chunks = _make_chunks(path)
+            upsert_note(path, chunks, _fake_embeddings(chunks), store)
+        assert count_note_chunks("ideas/it's-complicated.md", store) == 1
+        assert count_note_chunks("ideas/ghost.md", store) == 0
+
+    def test_deleted_note_counts_zero(self, tmp_path: Path) -> None:
+        store = VaultStore(tmp_path / "lance")
+        chunks = _make_chunks("ideas/voice-capture.md")
+        upsert_note("ideas/voice-capture.md", chunks, _fake_embeddings(chunks), store)
+        delete_note_from_index("ideas/voice-capture.md", store)
+        assert count_note_chunks("ideas/voice-capture.md", store) == 0
+
+
 class TestHybridSearch:
     def test_returns_results(self, tmp_path: Path) -> None:
         store = VaultStore(tmp_path / "lance")
@@ -6,7 +6,7 @@ from unittest.mock import patch, MagicMock
 
 import pytest
 
-from alaya.server import _maybe_start_reembed
+from alaya.server import _maybe_start_reembed, _start_embedder_warmup
 from alaya.backend.zk import ZkBackend
 from alaya.backend.protocol import VaultConfig, LinkResolution
 
@@ -72,3 +72,10 @@ def test_maybe_start_reembed_spawns_thread_on_mismatch(tmp_path: Path) -> None:
         import time; time.sleep(0.05)
 
     assert started
+
+
+def test_start_embedder_warmup_runs_in_background_thread() -> None:
+    loaded = threading.Event()
+    with patch("alaya.index.embedder.warmup", side_effect=loaded.set):
+        _start_embedder_warmup()
+        assert loaded.wait(timeout=1)
@@ -0,0 +1,14 @@
+"""Shared assertions and vault helpers for tool tests."""
+from pathlib import Path
+
+
+def assert_flag_value(args: list[str], flag: str, value: str) -> None:
+    """Assert that flag appears in a CLI argument list and is immediately followed by value."""
+    assert flag in args
+    assert args[args.index(flag) + 1] == value
+
+
+def append_text(path: Path, text: str) -> None:
+    """Append text to a vault file in place, without reading it back first."""
+    with path.open("a") as f:
+        f.write(text)
@@ -4,6 +4,7 @@ from pathlib import Path
 import pytest
 
 from alaya.tools.inbox import capture_to_inbox, get_inbox, clear_inbox_item
+from tests.unit.tools._helpers import append_text
 
 
 class TestCaptureToInbox:
@@ -74,7 +75,7 @@ class TestClearInboxItem:
         # a hypothetical item containing "complex" (which contains "alex" as substring).
         # Add an item whose text contains "alex" in a different context.
         inbox = vault / "inbox.md"
-        inbox.write_text(inbox.read_text() + "- 2026-02-28 10:00 complex infrastructure refactor\n")
+        append_text(inbox, "- 2026-02-28 10:00 complex infrastructure refactor\n")
 
         # Clearing by "alex" should only remove the "alex mentioned..." item, not "complex"
         clear_inbox_item("alex mentioned wanting more ownership on infrastructure work", vault)
@@ -4,7 +4,25 @@ from unittest.mock import MagicMock, patch, call
 
 import pytest
 
-from alaya.tools.ingest import ingest, batch_ingest, IngestResult, _fetch_url, _validate_url
+from alaya.index.store import reset_store
+from alaya.tools._ingest_cache import reset_cache
+from alaya.tools.ingest import (
+    ingest, batch_ingest, IngestResult, _fetch_url, _validate_url, reset_http_client, reset_ingest_state_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_ingest_state():
+    """Drop per-vault stores, cache connections, parsed ingest state and the shared HTTP client between tests."""
+    def reset() -> None:
+        reset_cache()
+        reset_http_client()
+        reset_ingest_state_cache()
+        reset_store()
+
+    reset()
+    yield
+    reset()
 
 
 SAMPLE_HTML = """
@@ -30,21 +48,21 @@ Every connection is treated as hostile until verified, eliminating implicit trus
 
 class TestIngestURL:
     def test_returns_ingest_result(self, vault: Path) -> None:
-        with patch("alaya.tools.ingest._fetch_url", return_value=("Understanding Kubernetes Operators", SAMPLE_HTML)), \
+        with patch("alaya.tools.ingest._fetch_url", return_value=("Understanding Kubernetes Operators", SAMPLE_HTML, "text/html")), \
              patch("alaya.tools.ingest._extract_text_from_html", return_value="Operators extend Kubernetes with custom controllers."), \
              patch("alaya.tools.ingest._index_content", return_value=3):
             result = ingest("https://example.com/k8s-operators", vault=vault)
         assert isinstance(result, IngestResult)
 
     def test_raw_text_returned(self, vault: Path) -> None:
-        with patch("alaya.tools.ingest._fetch_url", return_value=("K8s Operators", SAMPLE_HTML)), \
+        with patch("alaya.tools.ingest._fetch_url", return_value=("K8s Operators", SAMPLE_HTML, "text/html")), \
              patch("alaya.tools.ingest._extract_text_from_html", return_value="Operators extend Kubernetes."), \
              patch("alaya.tools.ingest._index_content", return_value=2):
             result = ingest("https://example.com/k8s-operators", vault=vault)
         assert "Operators" in result.raw_text
 
     def test_chunks_indexed(self, vault: Path) -> None:
-        with patch("alaya.tools.ingest._fetch_url", return_value=("K8s Operators", SAMPLE_HTML)), \
+        with patch("alaya.tools.ingest._fetch_url", return_value=("K8s Operators", SAMPLE_HTML, "text/html")), \
              patch("alaya.tools.ingest._extract_text_from_html", return_value="Content here."), \
              patch("alaya.tools.ingest._index_content", return_value=4):
             result = ingest("https://example.com/k8s-operators", vault=vault)
@@ -52,7 +70,7 @@ class TestIngestURL:
 
     def test_suggested_links_returned(self, vault: Path) -> None:
         mock_search = [{"path": "resources/kubernetes-notes.md", "title": "kubernetes-notes", "score": 0.9}]
-        with patch("alaya.tools.ingest._fetch_url", return_value=("K8s", SAMPLE_HTML)), \
+        with patch("alaya.tools.ingest._fetch_url", return_value=("K8s", SAMPLE_HTML, "text/html")), \
              patch("alaya.tools.ingest._extract_text_from_html", return_value="kubernetes content"), \
              patch("alaya.tools.ingest._index_content", return_value=1), \
              patch("alaya.tools.ingest._find_suggested_links", return_value=mock_search):
@@ -60,7 +78,7 @@ class TestIngestURL:
         assert isinstance(result.suggested_links, list)
 
     def test_title_override(self, vault: Path) -> None:
-        with patch("alaya.tools.ingest._fetch_url", return_value=("Original Title", SAMPLE_HTML)), \
+        with patch("alaya.tools.ingest._fetch_url", return_value=("Original Title", SAMPLE_HTML, "text/html")), \
              patch("alaya.tools.ingest._extract_text_from_html", return_value="content"), \
              patch("alaya.tools.ingest._index_content", return_value=1):
             result = ingest("https://example.com/k8s", title="Custom Title", vault=vault)
@@ -68,12 +86,22 @@ class TestIngestURL:
 
     def test_source_stored_in_result(self, vault: Path) -> None:
         url = "https://example.com/k8s-operators"
-        with patch("alaya.tools.ingest._fetch_url", return_value=("K8s", SAMPLE_HTML)), \
+        with patch("alaya.tools.ingest._fetch_url", return_value=("K8s", SAMPLE_HTML, "text/html")), \
              patch("alaya.tools.ingest._extract_text_from_html", return_value="content"), \
              patch("alaya.tools.ingest._index_content", return_value=1):
             result = ingest(url, vault=vault)
         assert result.source == url
 
+    @pytest.mark.parametrize("content_type", ["text/plain", "text/markdown"])
+    def test_plain_text_response_skips_html_extraction(self, vault: Path, content_type: str) -> None:
+        body = "# Operators\n\nOperators extend Kubernetes."
+        with patch("alaya.tools.ingest._fetch_url", return_value=("README.md", body, content_type)), \
+             patch("alaya.tools.ingest._extract_text_from_html") as mock_extract, \
+             patch("alaya.tools.ingest._index_content", return_value=1):
+            result = ingest("https://example.com/README.md", vault=vault)
+        mock_extract.assert_not_called()
+        assert result.raw_text == body
+
 
 class TestIngestPDF:
     def test_pdf_extracted_as_markdown(self, vault: Path) -> None:
@@ -117,6 +145,73 @@ class TestIngestPDF:
         assert "scanned" not in result.raw_text.lower()
 
 
+class TestExtractPdf:
+    """_extract_pdf splits long PDFs into page batches and keeps page order."""
+
+    def _make_pdf(self, path: Path, pages: int) -> Path:
+        import pymupdf
+        doc = pymupdf.open()
+        for i in range(pages):
+            doc.new_page().insert_text((72, 72), f"Page marker {i:03d}")
+        doc.save(path)
+        doc.close()
+        return path
+
+    def test_page_batches_are_contiguous_and_ordered(self) -> None:
+        from alaya.tools.ingest import _pdf_page_batches
+        batches = _pdf_page_batches(10, 3)
+        assert batches == [[0, 1, 2, 3], [4, 5, 6], [7, 8, 9]]
+
+    def test_short_pdf_extracted_in_process(self, tmp_path: Path) -> None:
+        from alaya.tools.ingest import _extract_pdf
+        pdf = self._make_pdf(tmp_path / "short.pdf", 2)
+        with patch("alaya.tools.ingest.ProcessPoolExecutor") as mock_pool:
+            text = _extract_pdf(str(pdf))
+        mock_pool.assert_not_called()
+        assert text.index("Page marker 000") < text.index("Page marker 001")
+
+    def test_long_pdf_batches_reassembled_in_page_order(self, tmp_path: Path) -> None:
+        from concurrent.futures import ThreadPoolExecutor
+        from alaya.tools.ingest import _extract_pdf
+        pdf = self._make_pdf(tmp_path / "long.pdf", 6)
+
+        def thread_pool(max_workers, mp_context):
+            return ThreadPoolExecutor(max_workers=max_workers)
+
+        with patch("alaya.tools.ingest._PDF_PAGES_PER_WORKER", 2), \
+             patch("alaya.tools.ingest.os.cpu_count", return_value=3), \
+             patch("alaya.tools.ingest.ProcessPoolExecutor", side_effect=thread_pool) as mock_pool:
+            text = _extract_pdf(str(pdf))
+        assert mock_pool.call_args.kwargs["max_workers"] == 3
+        positions = [text.index(f"Page marker {i:03d}") for i in range(6)]
+        assert positions == sorted(positions)
+
+    def test_long_pdf_extracted_in_spawned_workers(self, tmp_path: Path) -> None:
+        """Real spawn pool: _extract_pdf_pages must pickle and import cleanly in a fresh interpreter."""
+        from alaya.tools.ingest import _extract_pdf
+        pdf = self._make_pdf(tmp_path / "long.pdf", 4)
+        # the threshold is only read in the parent; a small one keeps the workers' share to two pages
+        with patch("alaya.tools.ingest._PDF_PAGES_PER_WORKER", 2), \
+             patch("alaya.tools.ingest.os.cpu_count", return_value=2):
+            text = _extract_pdf(str(pdf))
+        positions = [text.index(f"Page marker {i:03d}") for i in range(4)]
+        assert positions == sorted(positions)
+
+    @pytest.mark.parametrize("page_count,parallel", [(63, False), (64, True)])
+    def test_two_workers_need_pages_per_worker_each(self, page_count: int, parallel: bool) -> None:
+        from alaya.tools.ingest import _PDF_PAGES_PER_WORKER, _extract_pdf
+        assert page_count // _PDF_PAGES_PER_WORKER == (2 if parallel else 1)
+        doc = MagicMock(page_count=page_count)
+        with patch("pymupdf.open") as mock_open, \
+             patch("pymupdf4llm.to_markdown", return_value="text"), \
+             patch("alaya.tools.ingest.os.cpu_count", return_value=2), \
+             patch("alaya.tools.ingest.ProcessPoolExecutor") as mock_pool:
+            mock_open.return_value.__enter__.return_value = doc
+            mock_pool.return_value.__enter__.return_value.map.return_value = ["a", "b"]
+            _extract_pdf("long.pdf")
+        assert mock_pool.called is parallel
+
+
 class TestIngestMarkdown:
     def test_markdown_file_ingested_directly(self, vault: Path) -> None:
         with patch("alaya.tools.ingest._index_content", return_value=5), \
@@ -126,16 +221,109 @@ class TestIngestMarkdown:
         assert result.chunks_indexed == 5
 
     def test_idempotent_on_same_source(self, vault: Path) -> None:
-        with patch("alaya.tools.ingest._index_content", return_value=5), \
+        with patch("alaya.tools.ingest._index_content", return_value=5) as mock_index, \
+             patch("alaya.index.store.count_note_chunks", return_value=5), \
              patch("alaya.tools.ingest._find_suggested_links", return_value=[]):
             result1 = ingest("projects/second-brain.md", vault=vault)
             result2 = ingest("projects/second-brain.md", vault=vault)
         assert result1.source == result2.source
+        assert result2.chunks_indexed == 5
+        assert mock_index.call_count == 1
+
+    def test_modified_source_is_reindexed(self, vault: Path) -> None:
+        import os
+        note = vault / "projects" / "second-brain.md"
+        with patch("alaya.tools.ingest._index_content", return_value=5) as mock_index, \
+             patch("alaya.tools.ingest._find_suggested_links", return_value=[]):
+            ingest("projects/second-brain.md", vault=vault)
+            note.write_text(note.read_text() + "\nA new paragraph.\n")
+            st = note.stat()
+            os.utime(note, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+            ingest("projects/second-brain.md", vault=vault)
+        assert mock_index.call_count == 2
+
+    def test_changed_tags_are_reindexed(self, vault: Path) -> None:
+        with patch("alaya.tools.ingest._index_content", return_value=5) as mock_index, \
+             patch("alaya.tools.ingest._find_suggested_links", return_value=[]):
+            ingest("projects/second-brain.md", vault=vault)
+            ingest("projects/second-brain.md", tags=["reading"], vault=vault)
+        assert mock_index.call_count == 2
+
+    def test_unchanged_url_content_is_not_reindexed(self, vault: Path) -> None:
+        with patch("alaya.tools.ingest._fetch_url", return_value=("T", "<p>same</p>", "text/html")), \
+             patch("alaya.tools.ingest._extract_text_from_html", return_value="same body"), \
+             patch("alaya.tools.ingest._index_content", return_value=2) as mock_index, \
+             patch("alaya.index.store.count_note_chunks", return_value=2), \
+             patch("alaya.tools.ingest._find_suggested_links", return_value=[]):
+            ingest("https://example.com/a", vault=vault)
+            ingest("https://example.com/a", vault=vault)
+        assert mock_index.call_count == 1
+
+    def test_source_reindexed_when_its_chunks_leave_the_index(self, vault: Path) -> None:
+        """Real store: chunks deleted behind the state file's back must not turn re-ingest into a no-op."""
+        import numpy as np
+        from alaya.index.models import get_active_model
+        from alaya.index.store import count_note_chunks, delete_note_from_index, get_store
+
+        dim = get_active_model().dimensions
+        url = "https://example.com/a"
+        with patch("alaya.tools.ingest._fetch_url", return_value=("T", "<p>same</p>", "text/html")), \
+             patch("alaya.tools.ingest._extract_text_from_html", return_value="Operators extend Kubernetes."), \
+             patch("alaya.index.embedder.embed_chunks",
+                   side_effect=lambda chunks: [np.zeros(dim, dtype=np.float32) for _ in chunks]) as mock_embed, \
+             patch("alaya.tools.ingest._find_suggested_links", return_value=[]):
+            first = ingest(url, vault=vault)
+            store = get_store(vault)
+            assert count_note_chunks(url, store) == first.chunks_indexed == 1
+
+            ingest(url, vault=vault)
+            assert mock_embed.call_count == 1  # unchanged and still indexed: skipped
+
+            delete_note_from_index(url, store)
+            again = ingest(url, vault=vault)
+        assert mock_embed.call_count == 2
+        assert again.chunks_indexed == 1
+        assert count_note_chunks(url, store) == 1
+
+    def test_state_for_deleted_source_files_is_pruned(self, vault: Path) -> None:
+        import json
+        from alaya.tools.ingest import _ingest_state_path
+        doomed = vault / "resources" / "doomed.md"
+        doomed.parent.mkdir(exist_ok=True)
+        doomed.write_text("Short-lived source.\n")
+        with patch("alaya.tools.ingest._index_content", return_value=1), \
+             patch("alaya.tools.ingest._find_suggested_links", return_value=[]):
+            ingest("resources/doomed.md", vault=vault)
+            doomed.unlink()
+            ingest("projects/second-brain.md", vault=vault)
+        state = json.loads(_ingest_state_path(vault).read_text())
+        assert set(state) == {"projects/second-brain.md"}
+
+
+class TestSuggestedLinksEmbedding:
+    def test_reingest_embeds_query_once(self, vault: Path) -> None:
+        """embed_query is LRU-cached, so re-ingesting the same text skips the model."""
+        import numpy as np
+        from alaya.index.embedder import reset_model
+        from alaya.index.models import get_active_model
+
+        model = MagicMock()
+        model.query_embed.side_effect = lambda texts: iter([np.ones(4, dtype=np.float32)])
+        reset_model()
+        try:
+            with patch("alaya.index.embedder.get_model", return_value=(model, get_active_model())), \
+                 patch("alaya.index.store.hybrid_search", return_value=[]), \
+                 patch("alaya.tools.ingest._index_content", return_value=1):
+                ingest("projects/second-brain.md", vault=vault)
+                ingest("projects/second-brain.md", vault=vault)
+        finally:
+            reset_model()
+        assert model.query_embed.call_count == 1
 
 
 class TestIngestTags:
     def test_tags_passed_to_index(self, vault: Path) -> None:
-        with patch("alaya.tools.ingest._fetch_url", return_value=("Article", SAMPLE_HTML)), \
+        with patch("alaya.tools.ingest._fetch_url", return_value=("Article", SAMPLE_HTML, "text/html")), \
              patch("alaya.tools.ingest._extract_text_from_html", return_value="content"), \
              patch("alaya.tools.ingest._index_content", return_value=1) as mock_index:
             ingest("https://example.com/art", tags=["reference", "k8s"], vault=vault)
@@ -152,10 +340,12 @@ class TestFetchUrlRetry:
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.text = "<html>content</html>"
+        mock_response.headers = {"content-type": "Text/HTML; charset=utf-8"}
         mock_response.url = httpx.URL("https://example.com/page")
-        with patch("httpx.get", return_value=mock_response):
-            title, html = _fetch_url("https://example.com/page", _retries=3, _backoff=0)
+        with patch("httpx.Client.get", return_value=mock_response):
+            title, html, content_type = _fetch_url("https://example.com/page", _retries=3, _backoff=0)
         assert html == "<html>content</html>"
+        assert content_type == "text/html"
 
     def test_retries_on_transport_error_then_succeeds(self) -> None:
         import httpx
@@ -163,16 +353,16 @@ class TestFetchUrlRetry:
         mock_response.status_code = 200
         mock_response.text = "<html>content</html>"
         mock_response.url = httpx.URL("https://example.com/page")
-        with patch("httpx.get", side_effect=[
+        with patch("httpx.Client.get", side_effect=[
             httpx.TransportError("connection reset"),
             mock_response,
         ]), patch("time.sleep"):
-            title, html = _fetch_url("https://example.com/page", _retries=3, _backoff=0)
+            title, html, _ = _fetch_url("https://example.com/page", _retries=3, _backoff=0)
         assert html == "<html>content</html>"
 
     def test_raises_after_all_retries_exhausted(self) -> None:
         import httpx
-        with patch("httpx.get", side_effect=httpx.TransportError("timeout")), \
+        with patch("httpx.Client.get", side_effect=httpx.TransportError("timeout")), \
              patch("time.sleep"):
             with pytest.raises(httpx.TransportError):
                 _fetch_url("https://example.com/page", _retries=3, _backoff=0)
@@ -188,9 +378,9 @@ class TestFetchUrlRetry:
         ok_response.text = "content"
         ok_response.url = httpx.URL("https://example.com/page")
 
-        with patch("httpx.get", side_effect=[fail_response, ok_response]), \
+        with patch("httpx.Client.get", side_effect=[fail_response, ok_response]), \
              patch("time.sleep"):
-            _, html = _fetch_url("https://example.com/page", _retries=3, _backoff=0)
+            _, html, _ = _fetch_url("https://example.com/page", _retries=3, _backoff=0)
         assert html == "content"
 
     def test_does_not_retry_on_404(self) -> None:
@@ -201,12 +391,44 @@ class TestFetchUrlRetry:
         error_response.raise_for_status.side_effect = httpx.HTTPStatusError(
             "404", request=MagicMock(), response=error_response
         )
-        with patch("httpx.get", return_value=error_response) as mock_get:
+        with patch("httpx.Client.get", return_value=error_response) as mock_get:
             with pytest.raises(httpx.HTTPStatusError):
                 _fetch_url("https://example.com/missing", _retries=3, _backoff=0)
         # should only have been called once — no retry on 4xx
         assert mock_get.call_count == 1
 
+    def test_backoff_uses_full_jitter(self) -> None:
+        import httpx
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.text = "content"
+        mock_response.url = httpx.URL("https://example.com/page")
+        with patch("httpx.Client.get", side_effect=[
+            httpx.TransportError("reset"),
+            httpx.TransportError("reset"),
+            mock_response,
+        ]), patch("random.uniform", return_value=0.25) as mock_uniform, \
+             patch("time.sleep") as mock_sleep:
+            _fetch_url("https://example.com/page", _retries=3, _backoff=0.5)
+        # delay for attempt n is drawn from [0, backoff * 2**n]
+        assert [c.args for c in mock_uniform.call_args_list] == [(0, 0.5), (0, 1.0)]
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [0.25, 0.25]
+
+    def test_fetches_share_one_client(self) -> None:
+        from alaya.tools.ingest import _get_http_client
+        mock_client = MagicMock()
+        mock_client.get.return_value.status_code = 200
+        mock_client.get.return_value.text = "content"
+        mock_client.get.return_value.headers = {"content-type": "text/html; charset=utf-8"}
+        mock_client.get.return_value.url = "https://example.com/page"
+        with patch("httpx.Client", return_value=mock_client) as mock_cls, \
+             patch("alaya.tools.ingest._resolve_host_cached", return_value=("93.184.216.34",)):
+            _fetch_url("https://example.com/a", _retries=1, _backoff=0)
+            _fetch_url("https://example.com/b", _retries=1, _backoff=0)
+            assert _get_http_client() is mock_client
+        assert mock_cls.call_count == 1
+        assert mock_client.get.call_count == 2
+
 
 class TestValidateUrl:
     """Tests for SSRF protection in _validate_url."""
@@ -258,6 +480,52 @@ class TestValidateUrl:
             _validate_url("http:///no-host")
 
 
+class TestResolveHostCache:
+    """DNS lookups in _validate_url are memoised per hostname for a short TTL."""
+
+    @pytest.fixture(autouse=True)
+    def _fresh_cache(self):
+        from alaya.tools.ingest import _resolve_host_cached
+        _resolve_host_cached.cache_clear()
+        yield
+        _resolve_host_cached.cache_clear()
+
+    def _addrinfo(self, ip: str) -> list:
+        import socket
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (ip, 0))]
+
+    def test_repeated_host_resolved_once(self) -> None:
+        with patch("socket.getaddrinfo", return_value=self._addrinfo("93.184.216.34")) as mock_dns:
+            _validate_url("https://example.org/one")
+            _validate_url("https://EXAMPLE.org/two")
+        assert mock_dns.call_count == 1
+
+    def test_cached_private_resolution_still_blocked(self) -> None:
+        with patch("socket.getaddrinfo", return_value=self._addrinfo("10.0.0.5")) as mock_dns:
+            for _ in range(2):
+                with pytest.raises(ValueError, match="resolves to 10.0.0.5"):
+                    _validate_url("https://intranet.example.org/")
+        assert mock_dns.call_count == 1
+
+    def test_expired_entry_resolved_again(self) -> None:
+        from alaya.tools.ingest import _DNS_CACHE_TTL
+        answers = [self._addrinfo("93.184.216.34"), self._addrinfo("169.254.169.254")]
+        with patch("socket.getaddrinfo", side_effect=answers) as mock_dns, \
+             patch("alaya.tools.ingest.time.monotonic", return_value=1000.0) as mock_clock:
+            _validate_url("https://rebound.example.org/")
+            mock_clock.return_value = 1000.0 + _DNS_CACHE_TTL
+            with pytest.raises(ValueError, match="resolves to 169.254.169.254"):
+                _validate_url("https://rebound.example.org/")
+        assert mock_dns.call_count == 2
+
+    def test_resolution_failure_not_cached(self) -> None:
+        import socket
+        with patch("socket.getaddrinfo", side_effect=socket.gaierror("no such host")) as mock_dns:
+            _validate_url("https://flaky.example.org/")
+            _validate_url("https://flaky.example.org/")
+        assert mock_dns.call_count == 2
+
+
 class TestFetchUrlSsrf:
     """_fetch_url must reject SSRF attempts at the pre-request and post-redirect stage."""
 
@@ -274,7 +542,7 @@ class TestFetchUrlSsrf:
         # simulate redirect: response.url points to the internal address
         mock_response.url = httpx.URL("http://169.254.169.254/latest/meta-data/")
 
-        with patch("httpx.get", return_value=mock_response):
+        with patch("httpx.Client.get", return_value=mock_response):
             with pytest.raises(ValueError, match="Blocked"):
                 _fetch_url("https://example.com/redirect-me")
 
@@ -335,7 +603,110 @@ class TestIngestDate:
         assert "2026-01-01" not in captured.get("content", ""), "Date must not be hardcoded"
 
 
+class TestIngestCache:
+    """Fetched URLs and extracted PDFs are cached so re-ingesting skips the expensive step."""
+
+    def _ok_response(self, url: str) -> MagicMock:
+        import httpx
+        response = MagicMock()
+        response.status_code = 200
+        response.text = "<html>content</html>"
+        response.headers = {"content-type": "text/html; charset=utf-8"}
+        response.url = httpx.URL(url)
+        return response
+
+    def test_second_url_ingest_served_from_cache(self, vault: Path) -> None:
+        url = "https://example.com/k8s-operators"
+        with patch("httpx.Client.get", return_value=self._ok_response(url)) as mock_get, \
+             patch("alaya.tools.ingest._validate_url"), \
+             patch("alaya.tools.ingest._extract_text_from_html", return_value="Operators extend Kubernetes."), \
+             patch("alaya.tools.ingest._index_content", return_value=1), \
+             patch("alaya.tools.ingest._find_suggested_links", return_value=[]):
+            first = ingest(url, vault=vault)
+            second = ingest(url, vault=vault)
+        assert mock_get.call_count == 1
+        assert first.title == second.title == "k8s-operators"
+        assert second.raw_text == "Operators extend Kubernetes."
+
+    def test_url_fragment_and_host_case_share_cache_entry(self, vault: Path) -> None:
+        with patch("alaya.tools.ingest._fetch_url", return_value=("page", SAMPLE_HTML, "text/html")) as mock_fetch, \
+             patch("alaya.tools.ingest._extract_text_from_html", return_value="content"), \
+             patch("alaya.tools.ingest._index_content", return_value=1), \
+             patch("alaya.tools.ingest._find_suggested_links", return_value=[]):
+            ingest("https://example.com/page", vault=vault)
+            ingest("https://EXAMPLE.com/page#section", vault=vault)
+        assert mock_fetch.call_count == 1
+
+    def test_pdf_extraction_cached_by_content(self, vault: Path) -> None:
+        pdf_path = vault / "raw" / "zero-trust.pdf"
+        pdf_path.parent.mkdir(exist_ok=True)
+        pdf_path.write_bytes(b"%PDF-1.4 fake")
+
+        with patch("alaya.tools.ingest._extract_pdf", return_value=SAMPLE_PDF_MD) as mock_extract, \
+             patch("alaya.tools.ingest._index_content", return_value=3), \
+             patch("alaya.tools.ingest._find_suggested_links", return_value=[]):
+            ingest(str(pdf_path), vault=vault)
+            result = ingest(str(pdf_path), vault=vault)
+            assert mock_extract.call_count == 1
+            assert result.raw_text == SAMPLE_PDF_MD
+
+            pdf_path.write_bytes(b"%PDF-1.4 changed")
+            ingest(str(pdf_path), vault=vault)
+        assert mock_extract.call_count == 2
+
+    def test_hash_file_matches_in_memory_digest(self, tmp_path: Path) -> None:
+        import hashlib
+        from alaya.tools.ingest import _hash_file
+        data = b"%PDF-1.4 " + bytes(range(256)) * 4096
+        pdf = tmp_path / "big.pdf"
+        pdf.write_bytes(data)
+        assert _hash_file(pdf) == hashlib.sha256(data).digest()
+
+    def test_producer_errors_are_not_cached(self, tmp_path: Path) -> None:
+        from alaya.tools._ingest_cache import get_or_compute
+        key = b"\x01" * 32
+
+        def boom() -> str:
+            raise RuntimeError("network down")
+
+        with pytest.raises(RuntimeError):
+            get_or_compute(key, boom, tmp_path / "cache")
+        assert get_or_compute(key, lambda: "fresh", tmp_path / "cache") == "fresh"
+
+    def test_expired_entry_recomputed(self, tmp_path: Path) -> None:
+        from alaya.tools._ingest_cache import get_or_compute
+        key = b"\x02" * 32
+        get_or_compute(key, lambda: "old", tmp_path / "cache")
+        assert get_or_compute(key, lambda: "new", tmp_path / "cache", max_age=-1) == "new"
+
+    def test_unwritable_cache_falls_back_to_producer(self, tmp_path: Path) -> None:
+        from alaya.tools._ingest_cache import get_or_compute
+        blocker = tmp_path / "not-a-dir"
+        blocker.write_text("")
+        assert get_or_compute(b"\x03" * 32, lambda: "value", blocker / "cache") == "value"
+
+    def test_blob_read_happens_outside_the_index_lock(self, tmp_path: Path) -> None:
+        from alaya.tools import _ingest_cache
+        key = b"\x04" * 32
+        _ingest_cache.get_or_compute(key, lambda: "value", tmp_path / "cache")
+        real_read_bytes = Path.read_bytes
+        held = []
+
+        def read_bytes(self: Path) -> bytes:
+            held.append(_ingest_cache._lock.locked())
+            return real_read_bytes(self)
+
+        with patch.object(Path, "read_bytes", read_bytes):
+            assert _ingest_cache.get_or_compute(key, lambda: "recomputed", tmp_path / "cache") == "value"
+        assert held == [False]
+
+
 class TestBatchIngest:
+    @pytest.fixture(autouse=True)
+    def _no_prefetch(self):
+        with patch("alaya.tools.ingest._prefetch_urls", return_value={}):
+            yield
+
     def _ok_result(self, source: str) -> IngestResult:
         return IngestResult(title=source, source=source, raw_text="text", chunks_indexed=2)
 
@@ -366,3 +737,47 @@ class TestBatchIngest:
         with patch("alaya.tools.ingest.ingest", side_effect=results):
             result = batch_ingest(sources, tags=[], vault=vault)
         assert "6 chunks" in result
+
+
+class TestBatchPrefetch:
+    """batch_ingest fetches URLs concurrently before the sequential ingest loop."""
+
+    def test_urls_fetched_concurrently(self, vault: Path) -> None:
+        import threading
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fetch(url: str) -> tuple[str, str, str]:
+            barrier.wait()  # only passes if both fetches are in flight at once
+            return url.rsplit("/", 1)[-1], SAMPLE_HTML, "text/html"
+
+        with patch("alaya.tools.ingest._fetch_url", side_effect=fetch) as mock_fetch, \
+             patch("alaya.tools.ingest._extract_text_from_html", return_value="content"), \
+             patch("alaya.tools.ingest._index_content", return_value=1), \
+             patch("alaya.tools.ingest._find_suggested_links", return_value=[]):
+            result = batch_ingest(["https://a.com/one", "https://b.com/two"], tags=[], vault=vault)
+        assert "2 ok" in result
+        # ingest() reuses the prefetched pages from the cache
+        assert mock_fetch.call_count == 2
+
+    def test_failed_prefetch_reported_without_refetch(self, vault: Path) -> None:
+        import httpx
+
+        def fetch(url: str) -> tuple[str, str, str]:
+            if "bad" in url:
+                raise httpx.TransportError("connection refused")
+            return "good", SAMPLE_HTML, "text/html"
+
+        with patch("alaya.tools.ingest._fetch_url", side_effect=fetch) as mock_fetch, \
+             patch("alaya.tools.ingest._extract_text_from_html", return_value="content"), \
+             patch("alaya.tools.ingest._index_content", return_value=1), \
+             patch("alaya.tools.ingest._find_suggested_links", return_value=[]):
+            result = batch_ingest(["https://good.com/a", "https://bad.com/b"], tags=[], vault=vault)
+        assert "1 ok" in result
+        assert "ERR https://bad.com/b: connection refused" in result
+        assert mock_fetch.call_count == 2
+
+    def test_single_url_not_prefetched(self, vault: Path) -> None:
+        from alaya.tools.ingest import _prefetch_urls
+        with patch("alaya.tools.ingest._cached_fetch_url") as mock_fetch:
+            assert _prefetch_urls(["https://a.com", "projects/second-brain.md"], vault) == {}
+        mock_fetch.assert_not_called()
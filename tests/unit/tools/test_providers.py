@@ -1,11 +1,14 @@
 """Unit tests for GitHub and GitLab providers — subprocesses are mocked throughout."""
 import json
+import re
 from unittest.mock import patch
 
 import pytest
 
-from alaya.tools.providers.gitlab import GitLabProvider, GitLabError
-from alaya.tools.providers.github import GitHubProvider, GitHubError
+from alaya.tools.external import pull_external
+from alaya.tools.providers import github, gitlab
+from alaya.tools.providers.gitlab import GitLabProvider, GitLabError, _run_glab
+from alaya.tools.providers.github import GitHubProvider, GitHubError, _run_gh
 
 # --- fixtures ---
 
@@ -18,6 +21,9 @@ GITLAB_ISSUE = {
     "web_url": "https://gitlab.com/team/platform/-/issues/42",
 }
 
+GITLAB_ISSUE_JSON = json.dumps(GITLAB_ISSUE)
+GITLAB_ISSUE_LIST_JSON = json.dumps([GITLAB_ISSUE])
+
 GLAB_CREATE_OUTPUT = "https://gitlab.com/team/platform/-/issues/44\nIssue #44 created.\n"
 
 GITHUB_ISSUE = {
@@ -28,16 +34,28 @@ GITHUB_ISSUE = {
     "url": "https://github.com/org/repo/issues/7",
 }
 
+GITHUB_ISSUE_JSON = json.dumps(GITHUB_ISSUE)
+
 GH_CREATE_OUTPUT = "https://github.com/org/repo/issues/8\n"
 
 
+# Providers hold no state (env vars are read per call), so one instance per class is enough.
+@pytest.fixture(scope="class")
+def gitlab_provider() -> GitLabProvider:
+    return GitLabProvider()
+
+
+@pytest.fixture(scope="class")
+def github_provider() -> GitHubProvider:
+    return GitHubProvider()
+
+
 # --- GitLab ---
 
 class TestGitLabProviderFetchItem:
-    def test_fetch_item_returns_external_item(self):
-        provider = GitLabProvider()
-        with patch("alaya.tools.providers.gitlab._run_glab", return_value=json.dumps(GITLAB_ISSUE)):
-            item = provider.fetch_item("https://gitlab.com/team/platform/-/issues/42")
+    def test_fetch_item_returns_external_item(self, gitlab_provider):
+        with patch("alaya.tools.providers.gitlab._run_glab", return_value=GITLAB_ISSUE_JSON):
+            item = gitlab_provider.fetch_item("https://gitlab.com/team/platform/-/issues/42")
 
         assert item.title == "Add health check to api chart"
         assert item.url == "https://gitlab.com/team/platform/-/issues/42"
@@ -45,10 +63,9 @@ class TestGitLabProviderFetchItem:
         assert item.state == "opened"
         assert item.provider == "gitlab"
 
-    def test_fetch_item_passes_correct_args(self):
-        provider = GitLabProvider()
-        with patch("alaya.tools.providers.gitlab._run_glab", return_value=json.dumps(GITLAB_ISSUE)) as mock_glab:
-            provider.fetch_item("https://gitlab.com/team/platform/-/issues/42")
+    def test_fetch_item_passes_correct_args(self, gitlab_provider):
+        with patch("alaya.tools.providers.gitlab._run_glab", return_value=GITLAB_ISSUE_JSON) as mock_glab:
+            gitlab_provider.fetch_item("https://gitlab.com/team/platform/-/issues/42")
 
         args = mock_glab.call_args[0][0]
         assert "issue" in args
@@ -56,75 +73,46 @@ class TestGitLabProviderFetchItem:
         assert "42" in args
         assert "team/platform" in args
 
-    def test_fetch_item_invalid_url_raises(self):
-        provider = GitLabProvider()
+    def test_fetch_item_invalid_url_raises(self, gitlab_provider):
         with pytest.raises(GitLabError, match="Cannot parse"):
-            provider.fetch_item("https://not-gitlab.com/something")
+            gitlab_provider.fetch_item("https://not-gitlab.com/something")
 
 
 class TestGitLabProviderFetchItems:
-    def test_fetch_items_returns_list(self, monkeypatch):
+    def test_fetch_items_returns_list(self, monkeypatch, gitlab_provider):
         monkeypatch.setenv("GITLAB_PROJECT", "team/platform")
-        provider = GitLabProvider()
-        with patch("alaya.tools.providers.gitlab._run_glab", return_value=json.dumps([GITLAB_ISSUE])):
-            items = provider.fetch_items("gitlab:open")
+        with patch("alaya.tools.providers.gitlab._run_glab", return_value=GITLAB_ISSUE_LIST_JSON):
+            items = gitlab_provider.fetch_items("gitlab:open")
 
         assert len(items) == 1
         assert items[0].title == "Add health check to api chart"
 
-    def test_fetch_items_no_project_raises(self, monkeypatch):
+    def test_fetch_items_no_project_raises(self, monkeypatch, gitlab_provider):
         monkeypatch.delenv("GITLAB_PROJECT", raising=False)
-        provider = GitLabProvider()
         with pytest.raises(GitLabError, match="GITLAB_PROJECT"):
-            provider.fetch_items("gitlab:open")
+            gitlab_provider.fetch_items("gitlab:open")
 
 
 class TestGitLabProviderCreateItem:
-    def test_create_item_returns_url(self, monkeypatch):
+    def test_create_item_returns_url(self, monkeypatch, gitlab_provider):
         monkeypatch.setenv("GITLAB_PROJECT", "team/platform")
-        provider = GitLabProvider()
         with patch("alaya.tools.providers.gitlab._run_glab", return_value=GLAB_CREATE_OUTPUT):
-            url = provider.create_item("New issue", "Body.", [])
+            url = gitlab_provider.create_item("New issue", "Body.", [])
 
         assert "issues/44" in url
 
-    def test_create_item_no_project_raises(self, monkeypatch):
+    def test_create_item_no_project_raises(self, monkeypatch, gitlab_provider):
         monkeypatch.delenv("GITLAB_PROJECT", raising=False)
-        provider = GitLabProvider()
         with pytest.raises(GitLabError, match="GITLAB_PROJECT"):
-            provider.create_item("Title", "Body", [])
-
-
-class TestGlabCliNotFound:
-    def test_missing_glab_raises_helpful_error(self):
-        from alaya.tools.providers.gitlab import _run_glab
-        with patch("subprocess.run", side_effect=FileNotFoundError):
-            with pytest.raises(GitLabError) as exc_info:
-                _run_glab(["issue", "list"])
-        assert "glab CLI not found" in str(exc_info.value)
-        assert "brew install glab" in str(exc_info.value)
-
-    def test_missing_glab_surfaces_in_pull_external(self, tmp_path):
-        from alaya.tools.external import pull_external
-        (tmp_path / "projects").mkdir()
-        with patch("subprocess.run", side_effect=FileNotFoundError):
-            result = pull_external(
-                "https://gitlab.com/org/repo/-/issues/1",
-                directory="projects",
-                tags=[],
-                vault=tmp_path,
-            )
-        assert "[error]" in result
-        assert "glab CLI not found" in result
+            gitlab_provider.create_item("Title", "Body", [])
 
 
 # --- GitHub ---
 
 class TestGitHubProviderFetchItem:
-    def test_fetch_item_returns_external_item(self):
-        provider = GitHubProvider()
-        with patch("alaya.tools.providers.github._run_gh", return_value=json.dumps(GITHUB_ISSUE)):
-            item = provider.fetch_item("https://github.com/org/repo/issues/7")
+    def test_fetch_item_returns_external_item(self, github_provider):
+        with patch("alaya.tools.providers.github._run_gh", return_value=GITHUB_ISSUE_JSON):
+            item = github_provider.fetch_item("https://github.com/org/repo/issues/7")
 
         assert item.title == "Improve search ranking"
         assert item.url == "https://github.com/org/repo/issues/7"
@@ -132,46 +120,65 @@ class TestGitHubProviderFetchItem:
         assert item.state == "open"
         assert item.provider == "github"
 
-    def test_fetch_item_invalid_url_raises(self):
-        provider = GitHubProvider()
+    def test_fetch_item_invalid_url_raises(self, github_provider):
         with pytest.raises(GitHubError, match="Cannot parse"):
-            provider.fetch_item("https://not-github.com/something")
+            github_provider.fetch_item("https://not-github.com/something")
 
 
 class TestGitHubProviderCreateItem:
-    def test_create_item_returns_url(self, monkeypatch):
+    def test_create_item_returns_url(self, monkeypatch, github_provider):
         monkeypatch.setenv("GITHUB_REPO", "org/repo")
-        provider = GitHubProvider()
         with patch("alaya.tools.providers.github._run_gh", return_value=GH_CREATE_OUTPUT):
-            url = provider.create_item("New issue", "Body.", [])
+            url = github_provider.create_item("New issue", "Body.", [])
 
         assert "issues/8" in url
 
-    def test_create_item_no_repo_raises(self, monkeypatch):
+    def test_create_item_no_repo_raises(self, monkeypatch, github_provider):
         monkeypatch.delenv("GITHUB_REPO", raising=False)
-        provider = GitHubProvider()
         with pytest.raises(GitHubError, match="GITHUB_REPO"):
-            provider.create_item("Title", "Body", [])
+            github_provider.create_item("Title", "Body", [])
 
 
-class TestGhCliNotFound:
-    def test_missing_gh_raises_helpful_error(self):
-        from alaya.tools.providers.github import _run_gh
-        with patch("subprocess.run", side_effect=FileNotFoundError):
-            with pytest.raises(GitHubError) as exc_info:
-                _run_gh(["issue", "list"])
-        assert "gh CLI not found" in str(exc_info.value)
-        assert "brew install gh" in str(exc_info.value)
+# --- URL parsing ---
+
+class TestUrlPatterns:
+    @pytest.mark.parametrize("module", [gitlab, github])
+    def test_patterns_precompiled(self, module):
+        assert isinstance(module._REPO_RE, re.Pattern)
+        assert isinstance(module._ISSUE_RE, re.Pattern)
 
-    def test_missing_gh_surfaces_in_pull_external(self, tmp_path):
-        from alaya.tools.external import pull_external
+    @pytest.mark.parametrize("provider_cls,error,host", [
+        (GitLabProvider, GitLabError, "gitlab.com"),
+        (GitHubProvider, GitHubError, "github.com"),
+    ])
+    def test_long_unparseable_url_fails_fast(self, provider_cls, error, host):
+        # every repeat is bounded by "/", so deep paths cannot cause catastrophic backtracking
+        url = f"https://{host}/" + "a/" * 5000 + "repo"
+        with pytest.raises(error, match="Cannot parse"):
+            provider_cls().fetch_item(url)
+
+
+# --- CLI not installed ---
+
+class TestCliNotFound:
+    @pytest.mark.parametrize("run_cli,error,hints", [
+        (_run_glab, GitLabError, ("glab CLI not found", "brew install glab")),
+        (_run_gh, GitHubError, ("gh CLI not found", "brew install gh")),
+    ])
+    def test_missing_cli_raises_helpful_error(self, run_cli, error, hints):
+        with patch("subprocess.run", side_effect=FileNotFoundError):
+            with pytest.raises(error) as exc_info:
+                run_cli(["issue", "list"])
+        for hint in hints:
+            assert hint in str(exc_info.value)
+
+    @pytest.mark.parametrize("url,hint", [
+        ("https://gitlab.com/org/repo/-/issues/1", "glab CLI not found"),
+        ("https://github.com/org/repo/issues/1", "gh CLI not found"),
+    ])
+    def test_missing_cli_surfaces_in_pull_external(self, tmp_path, url, hint):
         (tmp_path / "projects").mkdir()
         with patch("subprocess.run", side_effect=FileNotFoundError):
-            result = pull_external(
-                "https://github.com/org/repo/issues/1",
-                directory="projects",
-                tags=[],
-                vault=tmp_path,
-            )
+            result = pull_external(url, directory="projects", tags=[], vault=tmp_path)
         assert "[error]" in result
-        assert "gh CLI not found" in result
+        assert hint in result
@@ -1,27 +1,36 @@
 """Unit tests for read tools — all zk calls are mocked."""
+from datetime import date
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
 from alaya.tools.read import get_note, get_note_by_title, list_notes, get_backlinks, get_links, get_tags
+from tests.unit.tools._helpers import assert_flag_value
 
 
+@pytest.fixture
+def vault(shared_vault: Path) -> Path:
+    """Read tools never write, so these tests share one session copy; writers use vault_rw."""
+    return shared_vault
+
+
+# Canned zk output, already stripped the way run_zk returns it.
 ZK_LIST_OUTPUT = """\
 projects/second-brain.md\tsecond-brain\t2026-02-23\t#project #python #mcp
 resources/kubernetes-notes.md\tkubernetes-notes\t2026-02-01\t#kubernetes #reference
 ideas/voice-capture.md\tvoice-capture\t2026-01-10\t#idea
-"""
+""".strip()
 
 ZK_BACKLINKS_OUTPUT = """\
 projects/second-brain.md\tsecond-brain
 daily/2026-02-25.md\t2026-02-25
-"""
+""".strip()
 
 ZK_LINKS_OUTPUT = """\
 resources/kubernetes-notes.md\tkubernetes-notes
 projects/platform-migration.md\tplatform-migration
-"""
+""".strip()
 
 ZK_TAGS_OUTPUT = """\
 kubernetes\t3
@@ -30,7 +39,15 @@ idea\t1
 mcp\t1
 python\t1
 reference\t1
-"""
+""".strip()
+
+
+class _FrozenDate(date):
+    """date with today() pinned, so cutoff arithmetic can't race midnight."""
+
+    @classmethod
+    def today(cls) -> date:
+        return cls(2026, 3, 1)
 
 
 class TestGetNote:
@@ -83,72 +100,48 @@ class TestGetNote:
         with pytest.raises(FileNotFoundError):
             get_note_by_title("this-note-does-not-exist", vault)
 
-    def test_title_lookup_ambiguous_raises(self, vault: Path) -> None:
+    def test_title_lookup_ambiguous_raises(self, vault_rw: Path) -> None:
         """Two notes in the vault fixture share the 'platform' title fragment — use exact match."""
         # Create a second note with the same title to force ambiguity
-        (vault / "ideas" / "second-brain-copy.md").write_text(
+        (vault_rw / "ideas" / "second-brain-copy.md").write_text(
             "---\ntitle: second-brain\ndate: 2026-02-01\n---\nDuplicate.\n"
         )
         with pytest.raises(ValueError, match="[Aa]mbiguous"):
-            get_note_by_title("second-brain", vault)
+            get_note_by_title("second-brain", vault_rw)
 
 
 class TestListNotes:
     def test_returns_markdown_table(self, vault: Path) -> None:
-        with patch("alaya.zk.run_zk", return_value=ZK_LIST_OUTPUT.strip()):
+        with patch("alaya.zk.run_zk", return_value=ZK_LIST_OUTPUT):
             result = list_notes(vault)
         assert "|" in result  # markdown table
         assert "second-brain" in result
 
-    def test_filter_by_dir(self, vault: Path) -> None:
-        with patch("alaya.zk.run_zk", return_value=ZK_LIST_OUTPUT.strip()) as mock_zk:
-            list_notes(vault, directory="projects")
-        args = mock_zk.call_args[0][0]
-        assert "projects" in args
-
-    def test_filter_by_tag(self, vault: Path) -> None:
-        with patch("alaya.zk.run_zk", return_value=ZK_LIST_OUTPUT.strip()) as mock_zk:
-            list_notes(vault, tag="kubernetes")
-        args = mock_zk.call_args[0][0]
-        assert any("kubernetes" in a for a in args)
+    # R-RD-03, R-SQ-02, R-SQ-04: each filter reaches zk as "<flag> <value>"
+    @pytest.mark.parametrize("kwarg,value,flag", [
+        ("directory", "projects", "--"),
+        ("tag", "kubernetes", "--tag"),
+        ("since", "2026-01-01", "--modified-after"),
+        ("until", "2026-02-28", "--modified-before"),
+        ("sort", "modified", "--sort"),
+    ])
+    def test_filter_passes_flag_to_zk(self, vault: Path, kwarg: str, value: str, flag: str) -> None:
+        with patch("alaya.zk.run_zk", return_value=ZK_LIST_OUTPUT) as mock_zk:
+            list_notes(vault, **{kwarg: value})
+        assert_flag_value(mock_zk.call_args[0][0], flag, value)
 
     def test_empty_vault_returns_message(self, vault: Path) -> None:
         with patch("alaya.zk.run_zk", return_value=""):
             result = list_notes(vault)
         assert "no notes" in result.lower()
 
-    # --- since / until / recent / sort (R-RD-03, R-SQ-02, R-SQ-04) ---
-
-    def test_since_passes_modified_after_to_zk(self, vault: Path) -> None:
-        with patch("alaya.zk.run_zk", return_value=ZK_LIST_OUTPUT.strip()) as mock_zk:
-            list_notes(vault, since="2026-01-01")
-        args = mock_zk.call_args[0][0]
-        assert "--modified-after" in args
-        assert "2026-01-01" in args
-
-    def test_until_passes_modified_before_to_zk(self, vault: Path) -> None:
-        with patch("alaya.zk.run_zk", return_value=ZK_LIST_OUTPUT.strip()) as mock_zk:
-            list_notes(vault, until="2026-02-28")
-        args = mock_zk.call_args[0][0]
-        assert "--modified-before" in args
-        assert "2026-02-28" in args
+    # --- recent (R-RD-03) ---
 
     def test_recent_converts_to_modified_after(self, vault: Path) -> None:
-        with patch("alaya.zk.run_zk", return_value=ZK_LIST_OUTPUT.strip()) as mock_zk:
+        with patch("alaya.tools.read.date", _FrozenDate), \
+             patch("alaya.zk.run_zk", return_value=ZK_LIST_OUTPUT) as mock_zk:
             list_notes(vault, recent=7)
-        args = mock_zk.call_args[0][0]
-        assert "--modified-after" in args
-        idx = args.index("--modified-after")
-        from datetime import date, timedelta
-        cutoff = date.today() - timedelta(days=7)
-        assert args[idx + 1] == cutoff.isoformat()
-
-    def test_sort_passes_sort_flag_to_zk(self, vault: Path) -> None:
-        with patch("alaya.zk.run_zk", return_value=ZK_LIST_OUTPUT.strip()) as mock_zk:
-            list_notes(vault, sort="modified")
-        args = mock_zk.call_args[0][0]
-        assert "--sort" in args
-        assert "modified" in args
+        assert_flag_value(mock_zk.call_args[0][0], "--modified-after", "2026-02-22")
 
     def test_recent_and_since_conflict_raises(self, vault: Path) -> None:
         with pytest.raises(ValueError, match="[Cc]onflict|not both|exclusive"):
@@ -157,7 +150,7 @@ class TestListNotes:
 
 class TestGetBacklinks:
     def test_returns_backlinks(self, vault: Path) -> None:
-        with patch("alaya.zk.run_zk", return_value=ZK_BACKLINKS_OUTPUT.strip()):
+        with patch("alaya.zk.run_zk", return_value=ZK_BACKLINKS_OUTPUT):
             result = get_backlinks("projects/second-brain.md", vault)
         assert "second-brain" in result
         assert "2026-02-25" in result
@@ -169,7 +162,7 @@ class TestGetBacklinks:
 
     def test_uses_link_to_flag(self, vault: Path) -> None:
         # --link-to PATH finds notes linking TO PATH (i.e. backlinks)
-        with patch("alaya.zk.run_zk", return_value=ZK_BACKLINKS_OUTPUT.strip()) as mock_zk:
+        with patch("alaya.zk.run_zk", return_value=ZK_BACKLINKS_OUTPUT) as mock_zk:
             get_backlinks("projects/second-brain.md", vault)
         args = mock_zk.call_args[0][0]
         assert "--link-to" in args
@@ -182,7 +175,7 @@ class TestGetBacklinks:
 
 class TestGetLinks:
     def test_returns_outgoing_links(self, vault: Path) -> None:
-        with patch("alaya.zk.run_zk", return_value=ZK_LINKS_OUTPUT.strip()):
+        with patch("alaya.zk.run_zk", return_value=ZK_LINKS_OUTPUT):
             result = get_links("projects/second-brain.md", vault)
         assert "kubernetes-notes" in result
         assert "platform-migration" in result
@@ -194,7 +187,7 @@ class TestGetLinks:
 
     def test_uses_linked_by_flag(self, vault: Path) -> None:
         # --linked-by PATH finds notes linked by PATH (i.e. forward/outgoing links)
-        with patch("alaya.zk.run_zk", return_value=ZK_LINKS_OUTPUT.strip()) as mock_zk:
+        with patch("alaya.zk.run_zk", return_value=ZK_LINKS_OUTPUT) as mock_zk:
             get_links("projects/second-brain.md", vault)
         args = mock_zk.call_args[0][0]
         assert "--linked-by" in args
@@ -203,13 +196,13 @@ class TestGetLinks:
 
 class TestGetTags:
     def test_returns_all_tags_with_counts(self, vault: Path) -> None:
-        with patch("alaya.zk.run_zk", return_value=ZK_TAGS_OUTPUT.strip()):
+        with patch("alaya.zk.run_zk", return_value=ZK_TAGS_OUTPUT):
             result = get_tags(vault)
         assert "kubernetes" in result
         assert "3" in result
 
     def test_returns_markdown_table(self, vault: Path) -> None:
-        with patch("alaya.zk.run_zk", return_value=ZK_TAGS_OUTPUT.strip()):
+        with patch("alaya.zk.run_zk", return_value=ZK_TAGS_OUTPUT):
             result = get_tags(vault)
         assert "|" in result
 
@@ -5,17 +5,26 @@ from unittest.mock import patch
 import pytest
 
 from alaya.tools.search import search_notes
+from tests.unit.tools._helpers import assert_flag_value
 
 
+# Canned zk output, already stripped the way run_zk returns it.
 ZK_SEARCH_OUTPUT = """\
 projects/second-brain.md\tsecond-brain\t2026-02-23
 resources/kubernetes-notes.md\tkubernetes-notes\t2026-02-01
-"""
+""".strip()
+
+
+@pytest.fixture(autouse=True)
+def _no_index():
+    """Pin the zk keyword path so no test opens a LanceDB store in the fixture vault."""
+    with patch("alaya.tools.search._hybrid_search_available", return_value=False):
+        yield
 
 
 class TestSearchNotes:
     def test_returns_results_for_keyword(self, vault: Path) -> None:
-        with patch("alaya.zk.run_zk", return_value=ZK_SEARCH_OUTPUT.strip()):
+        with patch("alaya.zk.run_zk", return_value=ZK_SEARCH_OUTPUT):
             result = search_notes("kubernetes", vault)
         assert "kubernetes-notes" in result
         assert "second-brain" in result
@@ -31,37 +40,28 @@ class TestSearchNotes:
         args = mock_zk.call_args[0][0]
         assert any("helm charts" in a for a in args)
 
-    def test_filter_by_directory(self, vault: Path) -> None:
-        with patch("alaya.zk.run_zk", return_value=ZK_SEARCH_OUTPUT.strip()) as mock_zk:
-            search_notes("kubernetes", vault, directory="resources")
-        args = mock_zk.call_args[0][0]
-        assert "resources" in args
+    # R-SQ-02: each filter reaches zk as "<flag> <value>"
+    @pytest.mark.parametrize("kwarg,value,flag,expected", [
+        ("directory", "resources", "--", "resources"),
+        ("tags", ["kubernetes"], "--tag", "kubernetes"),
+        ("since", "2026-01-01", "--modified-after", "2026-01-01"),
+    ])
+    def test_filter_passes_flag_to_zk(self, vault: Path, kwarg: str, value, flag: str, expected: str) -> None:
+        with patch("alaya.zk.run_zk", return_value=ZK_SEARCH_OUTPUT) as mock_zk:
+            search_notes("kubernetes", vault, **{kwarg: value})
+        assert_flag_value(mock_zk.call_args[0][0], flag, expected)
 
     def test_returns_markdown(self, vault: Path) -> None:
-        with patch("alaya.zk.run_zk", return_value=ZK_SEARCH_OUTPUT.strip()):
+        with patch("alaya.zk.run_zk", return_value=ZK_SEARCH_OUTPUT):
             result = search_notes("kubernetes", vault)
         assert isinstance(result, str)
         assert "|" in result  # markdown table
 
-    # --- tags and since filters (R-SQ-02) ---
-
-    def test_filter_by_tag_passes_tag_to_zk(self, vault: Path) -> None:
-        with patch("alaya.zk.run_zk", return_value=ZK_SEARCH_OUTPUT.strip()) as mock_zk:
-            search_notes("kubernetes", vault, tags=["kubernetes"])
-        args = mock_zk.call_args[0][0]
-        assert "--tag" in args
-        assert "kubernetes" in args
+    # --- multiple tags (R-SQ-02) ---
 
     def test_filter_by_multiple_tags(self, vault: Path) -> None:
-        with patch("alaya.zk.run_zk", return_value=ZK_SEARCH_OUTPUT.strip()) as mock_zk:
+        with patch("alaya.zk.run_zk", return_value=ZK_SEARCH_OUTPUT) as mock_zk:
             search_notes("notes", vault, tags=["kubernetes", "reference"])
         args = mock_zk.call_args[0][0]
         # each tag should appear after --tag
         assert args.count("--tag") == 2
-
-    def test_since_passes_modified_after_to_zk(self, vault: Path) -> None:
-        with patch("alaya.zk.run_zk", return_value=ZK_SEARCH_OUTPUT.strip()) as mock_zk:
-            search_notes("notes", vault, since="2026-01-01")
-        args = mock_zk.call_args[0][0]
-        assert "--modified-after" in args
-        assert "2026-01-01" in args
@@ -1,8 +1,8 @@
 """M3 additions to search: hybrid path, reindex_vault."""
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import patch
 
-import numpy as np
 import pytest
 
 from alaya.tools.search import search_notes
@@ -44,12 +44,9 @@ class TestReindexVault:
         assert "confirm" in result.lower()
 
     def test_returns_stats_on_success(self, vault: Path) -> None:
-        mock_result = MagicMock()
-        mock_result.notes_indexed = 12
-        mock_result.chunks_created = 47
-        mock_result.duration_seconds = 3.2
-        mock_result.notes_skipped = 5
-        mock_result.notes_deleted = 0
+        mock_result = SimpleNamespace(
+            notes_indexed=12, chunks_created=47, duration_seconds=3.2, notes_skipped=5, notes_deleted=0,
+        )
 
         with patch("alaya.index.reindex.reindex_incremental", return_value=mock_result):
             result = reindex_vault(vault, confirm=True)
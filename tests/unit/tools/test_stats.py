@@ -6,34 +6,36 @@ import pytest
 from alaya.tools.stats import vault_stats
 
 
+@pytest.fixture
+def vault(shared_vault: Path) -> Path:
+    """vault_stats never writes, so every test here reads the same session copy."""
+    return shared_vault
+
+
+@pytest.fixture(scope="module")
+def empty_vault(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    return tmp_path_factory.mktemp("empty_vault")
+
+
+@pytest.fixture(scope="module")
+def untagged_vault(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    solo = tmp_path_factory.mktemp("untagged_vault")
+    (solo / "note.md").write_text("---\ntitle: Untagged\ndate: 2026-01-01\n---\nBody.\n")
+    return solo
+
+
 class TestVaultStats:
-    def test_returns_note_count(self, vault: Path) -> None:
-        result = vault_stats(vault)
-        assert "note" in result
-
-    def test_lists_directories(self, vault: Path) -> None:
-        result = vault_stats(vault)
-        assert "Notes by directory:" in result
-        # fixture has ideas/ and projects/ directories
-        assert "ideas" in result
-        assert "projects" in result
-
-    def test_lists_top_tags(self, vault: Path) -> None:
-        result = vault_stats(vault)
-        # fixture notes have tags; section should appear
-        assert "Top tags:" in result
-
-    def test_empty_vault(self, tmp_path: Path) -> None:
-        empty = tmp_path / "empty_vault"
-        empty.mkdir()
-        result = vault_stats(empty)
-        assert "empty" in result.lower()
-
-    def test_vault_with_no_tags(self, tmp_path: Path) -> None:
-        solo = tmp_path / "solo_vault"
-        solo.mkdir()
-        note = solo / "note.md"
-        note.write_text("---\ntitle: Untagged\ndate: 2026-01-01\n---\nBody.\n")
-        result = vault_stats(solo)
-        assert "1 note" in result
-        assert "Top tags:" not in result
+    @pytest.mark.parametrize("vault_name,present,absent", [
+        # fixture notes live in ideas/ and projects/ and carry tags
+        ("vault", ["note", "Notes by directory:", "ideas", "projects", "Top tags:"], []),
+        ("empty_vault", ["Vault is empty"], []),
+        ("untagged_vault", ["1 note"], ["Top tags:"]),
+    ], ids=["fixture", "empty", "no-tags"])
+    def test_vault_stats(
+        self, request: pytest.FixtureRequest, vault_name: str, present: list[str], absent: list[str]
+    ) -> None:
+        result = vault_stats(request.getfixturevalue(vault_name))
+        for text in present:
+            assert text in result
+        for text in absent:
+            assert text not in result
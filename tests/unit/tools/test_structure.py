@@ -5,6 +5,22 @@ from unittest.mock import patch
 import pytest
 
 from alaya.tools.structure import move_note, rename_note, delete_note, find_references, find_and_replace_wikilinks, _iter_vault_md
+from tests.unit.tools._helpers import append_text
+
+
+def _read_text_failing_for(name: str):
+    """Return a Path.read_text replacement that raises PermissionError for files called name.
+
+    Stands in for chmod(0o000), which has no effect when the suite runs as root.
+    """
+    real_read_text = Path.read_text
+
+    def read_text(self: Path, *args, **kwargs) -> str:
+        if self.name == name:
+            raise PermissionError(13, "Permission denied", str(self))
+        return real_read_text(self, *args, **kwargs)
+
+    return read_text
 
 
 class TestMoveNote:
@@ -17,10 +33,6 @@ class TestMoveNote:
         new_path = move_note("ideas/voice-capture.md", "projects", vault)
         assert new_path == "projects/voice-capture.md"
 
-    def test_source_missing_raises(self, vault: Path) -> None:
-        with pytest.raises(FileNotFoundError):
-            move_note("ideas/ghost.md", "projects", vault)
-
     def test_invalid_destination_raises(self, vault: Path) -> None:
         with pytest.raises(ValueError):
             move_note("ideas/voice-capture.md", "../../etc", vault)
@@ -29,7 +41,7 @@ class TestMoveNote:
         # zk uses title-based wikilinks ([[title]]). Moving a file changes its
         # directory but not its title, so existing wikilinks remain valid.
         note = vault / "projects/second-brain.md"
-        note.write_text(note.read_text() + "\n- [[voice-capture]]\n")
+        append_text(note, "\n- [[voice-capture]]\n")
 
         move_note("ideas/voice-capture.md", "resources", vault)
 
@@ -38,10 +50,6 @@ class TestMoveNote:
         # the file itself is at the new location
         assert (vault / "resources/voice-capture.md").exists()
 
-    def test_path_traversal_rejected(self, vault: Path) -> None:
-        with pytest.raises(ValueError):
-            move_note("../../etc/passwd", "projects", vault)
-
 
 class TestRenameNote:
     def test_file_renamed(self, vault: Path) -> None:
@@ -61,7 +69,7 @@ class TestRenameNote:
     def test_wikilinks_updated_vault_wide(self, vault: Path) -> None:
         # plant a wikilink in another note
         ref = vault / "projects/second-brain.md"
-        ref.write_text(ref.read_text() + "\n- [[voice-capture]]\n")
+        append_text(ref, "\n- [[voice-capture]]\n")
 
         rename_note("ideas/voice-capture.md", "audio-capture", vault)
 
@@ -78,7 +86,7 @@ class TestRenameNote:
             "---\ntitle: My Special Note\ndate: 2026-01-01\n---\nContent.\n"
         )
         ref = vault / "projects/second-brain.md"
-        ref.write_text(ref.read_text() + "\n- [[My Special Note]]\n")
+        append_text(ref, "\n- [[My Special Note]]\n")
 
         rename_note("ideas/timestamped-note.md", "renamed-note", vault)
 
@@ -86,14 +94,6 @@ class TestRenameNote:
         assert "[[renamed-note]]" in content
         assert "[[My Special Note]]" not in content
 
-    def test_source_missing_raises(self, vault: Path) -> None:
-        with pytest.raises(FileNotFoundError):
-            rename_note("ideas/ghost.md", "something", vault)
-
-    def test_path_traversal_rejected(self, vault: Path) -> None:
-        with pytest.raises(ValueError):
-            rename_note("../../etc/passwd", "new", vault)
-
 
 class TestDeleteNote:
     def test_moves_to_archives(self, vault: Path) -> None:
@@ -122,20 +122,32 @@ class TestDeleteNote:
         with pytest.raises(ValueError, match="already archived"):
             delete_note("archives/voice-capture.md", vault)
 
-    def test_source_missing_raises(self, vault: Path) -> None:
-        with pytest.raises(FileNotFoundError):
-            delete_note("ideas/ghost.md", vault)
 
-    def test_path_traversal_rejected(self, vault: Path) -> None:
+class TestInvalidSource:
+    @pytest.mark.parametrize("fn,args", [
+        (move_note, ("ideas/ghost.md", "projects")),
+        (rename_note, ("ideas/ghost.md", "something")),
+        (delete_note, ("ideas/ghost.md",)),
+    ], ids=["move_note", "rename_note", "delete_note"])
+    def test_source_missing_raises(self, vault: Path, fn, args: tuple) -> None:
+        with pytest.raises(FileNotFoundError):
+            fn(*args, vault)
+
+    @pytest.mark.parametrize("fn,args", [
+        (move_note, ("../../etc/passwd", "projects")),
+        (rename_note, ("../../etc/passwd", "new")),
+        (delete_note, ("../../etc/passwd",)),
+    ], ids=["move_note", "rename_note", "delete_note"])
+    def test_path_traversal_rejected(self, vault: Path, fn, args: tuple) -> None:
         with pytest.raises(ValueError):
-            delete_note("../../etc/passwd", vault)
+            fn(*args, vault)
 
 
 class TestFindReferences:
     def test_finds_wikilink_references(self, vault: Path) -> None:
         # plant a known wikilink
         ref = vault / "projects/second-brain.md"
-        ref.write_text(ref.read_text() + "\n- [[voice-capture]]\n")
+        append_text(ref, "\n- [[voice-capture]]\n")
 
         results = find_references("voice-capture", vault)
         paths = [r["path"] for r in results]
@@ -155,22 +167,19 @@ class TestFindReferences:
     def test_text_mentions_included_when_requested(self, vault: Path) -> None:
         # plant a text mention (not a wikilink)
         ref = vault / "projects/second-brain.md"
-        ref.write_text(ref.read_text() + "\nThis mentions voice-capture as plain text.\n")
+        append_text(ref, "\nThis mentions voice-capture as plain text.\n")
 
         results = find_references("voice-capture", vault, include_text_mentions=True)
         types = {r["type"] for r in results}
         assert "text" in types
 
     def test_unreadable_file_does_not_crash_scan(self, vault: Path) -> None:
-        bad = vault / "ideas/unreadable.md"
-        bad.write_text("[[voice-capture]]")
-        bad.chmod(0o000)
-        try:
+        (vault / "ideas/unreadable.md").write_text("[[voice-capture]]")
+        with patch.object(Path, "read_text", _read_text_failing_for("unreadable.md")):
             results = find_references("voice-capture", vault)
-            # scan completes; unreadable file is silently skipped
-            assert isinstance(results, list)
-        finally:
-            bad.chmod(0o644)
+        # scan completes; unreadable file is silently skipped
+        assert isinstance(results, list)
+        assert "ideas/unreadable.md" not in {r["path"] for r in results}
 
     def test_skip_dirs_excluded_from_scan(self, tmp_path: Path) -> None:
         """Files inside .git / .zk / .venv are not yielded."""
@@ -197,12 +206,9 @@ class TestFindAndReplaceWikilinks:
         assert "[[new-title]]" in note.read_text()
 
     def test_unreadable_file_does_not_abort(self, vault: Path) -> None:
-        bad = vault / "ideas/unreadable.md"
-        bad.write_text("[[old-title]]")
-        bad.chmod(0o000)
-        try:
+        (vault / "ideas/unreadable.md").write_text("[[old-title]]")
+        (vault / "ideas/linker.md").write_text("See [[old-title]] for more.\n")
+        with patch.object(Path, "read_text", _read_text_failing_for("unreadable.md")):
             # should not raise despite unreadable file
             updated = find_and_replace_wikilinks("old-title", "new-title", vault)
-            assert isinstance(updated, list)
-        finally:
-            bad.chmod(0o644)
+        assert updated == ["ideas/linker.md"]
@@ -4,9 +4,22 @@ from pathlib import Path
 import pytest
 
 from alaya.tools.tasks import get_todos, complete_todo
+from tests.unit.tools._helpers import append_text
+
+
+@pytest.fixture
+def scaffold_task(vault: Path) -> dict:
+    """The open 'scaffold project structure' task, with line number from get_todos."""
+    todos = get_todos(vault, directories=["projects"])
+    return next(t for t in todos if "scaffold project structure" in t["text"])
 
 
 class TestGetTodos:
+    @pytest.fixture
+    def vault(self, shared_vault: Path) -> Path:
+        """get_todos never writes, so these tests read the same session copy."""
+        return shared_vault
+
     def test_finds_open_tasks(self, vault: Path) -> None:
         results = get_todos(vault)
         # second-brain.md has open tasks
@@ -32,6 +45,8 @@ class TestGetTodos:
         for t in results:
             assert t["path"].startswith("projects/")
 
+
+class TestGetTodosAfterEdits:
     def test_no_todos_returns_empty_list(self, vault: Path) -> None:
         # overwrite a note with no open tasks
         (vault / "projects/platform-migration.md").write_text(
@@ -44,18 +59,14 @@ class TestGetTodos:
     def test_also_finds_tasks_in_daily_notes(self, vault: Path) -> None:
         # plant a task in a daily note
         daily = vault / "daily/2026-02-25.md"
-        daily.write_text(daily.read_text() + "\n- [ ] follow up on PR review\n")
+        append_text(daily, "\n- [ ] follow up on PR review\n")
         results = get_todos(vault)
         tasks = [t["text"] for t in results]
         assert any("follow up on PR review" in t for t in tasks)
 
 
 class TestCompleteTodo:
-    def test_marks_task_complete(self, vault: Path) -> None:
-        # get line number from get_todos
-        todos = get_todos(vault, directories=["projects"])
-        scaffold_task = next(t for t in todos if "scaffold project structure" in t["text"])
-
+    def test_marks_task_complete(self, vault: Path, scaffold_task: dict) -> None:
         complete_todo(
             path=scaffold_task["path"],
             line=scaffold_task["line"],
@@ -66,10 +77,7 @@ class TestCompleteTodo:
         content = (vault / scaffold_task["path"]).read_text()
         assert "- [x] scaffold project structure" in content
 
-    def test_open_marker_removed(self, vault: Path) -> None:
-        todos = get_todos(vault, directories=["projects"])
-        scaffold_task = next(t for t in todos if "scaffold project structure" in t["text"])
-
+    def test_open_marker_removed(self, vault: Path, scaffold_task: dict) -> None:
         complete_todo(
             path=scaffold_task["path"],
             line=scaffold_task["line"],
@@ -80,11 +88,8 @@ class TestCompleteTodo:
         content = (vault / scaffold_task["path"]).read_text()
         assert "- [ ] scaffold project structure" not in content
 
-    def test_fuzzy_line_fallback(self, vault: Path) -> None:
+    def test_fuzzy_line_fallback(self, vault: Path, scaffold_task: dict) -> None:
         # pass a stale line number (off by 3) — should still find it via task_text
-        todos = get_todos(vault, directories=["projects"])
-        scaffold_task = next(t for t in todos if "scaffold project structure" in t["text"])
-
         complete_todo(
             path=scaffold_task["path"],
             line=scaffold_task["line"] + 3,  # stale
@@ -4,11 +4,33 @@ from unittest.mock import patch
 
 import pytest
 
-from alaya.tools.write import create_note, append_to_note, update_tags, _load_template, _render_template, _build_note_content, _check_duplicates
+from alaya.tools.write import create_note, append_to_note, update_tags, _load_template, _render_template, _check_duplicates
+
+
+@pytest.fixture(scope="module")
+def original_second_brain(shared_vault: Path) -> str:
+    """Unmodified text of projects/second-brain.md, read once per module."""
+    return (shared_vault / "projects/second-brain.md").read_text()
+
+
+MEETING_TEMPLATE = "---\ntitle: {title}\ndate: {date}\n---\n{tags}\n\n## Agenda\n\n{body}\n"
+IDEAS_TEMPLATE = "---\ntitle: {title}\ndate: {date}\n---\nIdea: {body}\n"
+DEFAULT_TEMPLATE = "---\ntitle: {title}\ndate: {date}\n---\nDefault: {body}\n"
+
+
+@pytest.fixture
+def vault_with_templates(vault: Path) -> Path:
+    """Vault with a named (meeting), a per-directory (ideas) and a default template."""
+    templates = vault / "templates"
+    templates.mkdir()
+    (templates / "meeting.md").write_text(MEETING_TEMPLATE)
+    (templates / "ideas.md").write_text(IDEAS_TEMPLATE)
+    (templates / "default.md").write_text(DEFAULT_TEMPLATE)
+    return vault
 
 
 class TestCreateNote:
-    def test_creates_file_in_correct_dir(self, vault: Path) -> None:
+    def test_creates_note_with_frontmatter_tags_and_body(self, vault: Path) -> None:
         path = create_note(
             title="test note",
             directory="ideas",
@@ -16,104 +38,52 @@ class TestCreateNote:
             body="Some content here.",
             vault=vault,
         )
-        assert (vault / path).exists()
+        assert isinstance(path, str)
+        assert not path.startswith("/")
         assert "ideas" in path
+        assert (vault / path).exists()
 
-    def test_frontmatter_contains_title_and_date(self, vault: Path) -> None:
-        path = create_note(
-            title="frontmatter check",
-            directory="ideas",
-            tags=[],
-            body="",
-            vault=vault,
-        )
         content = (vault / path).read_text()
         assert "title:" in content
         assert "date:" in content
-
-    def test_tags_written_inline(self, vault: Path) -> None:
-        path = create_note(
-            title="tagged note",
-            directory="ideas",
-            tags=["foo", "bar"],
-            body="",
-            vault=vault,
-        )
-        content = (vault / path).read_text()
-        assert "#foo" in content
-        assert "#bar" in content
-
-    def test_body_written_to_file(self, vault: Path) -> None:
-        path = create_note(
-            title="body note",
-            directory="resources",
-            tags=[],
-            body="This is the body content.",
-            vault=vault,
-        )
-        content = (vault / path).read_text()
-        assert "This is the body content." in content
-
-    def test_invalid_directory_raises(self, vault: Path) -> None:
-        with pytest.raises(ValueError):
-            create_note(
-                title="bad dir",
-                directory="../../etc",
-                tags=[],
-                body="",
-                vault=vault,
-            )
-
-    def test_returns_relative_path_string(self, vault: Path) -> None:
-        path = create_note(
-            title="path return",
-            directory="ideas",
-            tags=[],
-            body="",
-            vault=vault,
-        )
-        assert isinstance(path, str)
-        assert not path.startswith("/")
+        assert "#idea" in content
+        assert "#test" in content
+        assert "Some content here." in content
 
     def test_duplicate_raises_file_exists_error(self, vault: Path) -> None:
         create_note(title="dupe note", directory="ideas", tags=[], body="original", vault=vault)
         with pytest.raises(FileExistsError, match="already exists"):
             create_note(title="dupe note", directory="ideas", tags=[], body="overwrite attempt", vault=vault)
 
-    def test_empty_slug_title_raises(self, vault: Path) -> None:
-        with pytest.raises(ValueError, match="alphanumeric"):
-            create_note(title="!!!", directory="ideas", tags=[], body="", vault=vault)
-
-    def test_dash_only_title_raises(self, vault: Path) -> None:
-        with pytest.raises(ValueError, match="alphanumeric"):
-            create_note(title="---", directory="ideas", tags=[], body="", vault=vault)
-
     def test_valid_title_with_special_chars_succeeds(self, vault: Path) -> None:
         # special chars stripped, leaving a valid slug
         path = create_note(title="hello! world?", directory="ideas", tags=[], body="", vault=vault)
         assert "hello" in path
 
-    def test_invalid_tag_raises(self, vault: Path) -> None:
-        with pytest.raises(ValueError, match="Invalid tag"):
-            create_note(title="valid title", directory="ideas", tags=["bad:tag"], body="", vault=vault)
-
-    def test_tag_with_colon_raises(self, vault: Path) -> None:
-        with pytest.raises(ValueError, match="Invalid tag"):
-            create_note(title="valid title", directory="ideas", tags=["key:value"], body="", vault=vault)
-
     def test_valid_tags_accepted(self, vault: Path) -> None:
         path = create_note(title="tagged note", directory="ideas", tags=["python", "my-tag", "tag_2"], body="", vault=vault)
         assert path.endswith(".md")
 
+    @pytest.mark.parametrize("title,directory,tags,match", [
+        ("bad dir", "../../etc", [], None),
+        ("!!!", "ideas", [], "alphanumeric"),
+        ("---", "ideas", [], "alphanumeric"),
+        ("valid title", "ideas", ["bad:tag"], "Invalid tag"),
+        ("valid title", "ideas", ["key:value"], "Invalid tag"),
+    ], ids=["invalid-directory", "empty-slug", "dash-only-title", "invalid-tag", "tag-with-colon"])
+    def test_invalid_input_raises(
+        self, vault: Path, title: str, directory: str, tags: list[str], match: str | None
+    ) -> None:
+        with pytest.raises(ValueError, match=match):
+            create_note(title=title, directory=directory, tags=tags, body="", vault=vault)
+
 
 class TestTemplates:
     def test_load_template_returns_none_if_missing(self, vault: Path) -> None:
         assert _load_template(vault, "nonexistent") is None
 
-    def test_load_template_reads_file(self, vault: Path) -> None:
-        (vault / "templates").mkdir(exist_ok=True)
-        (vault / "templates" / "meeting.md").write_text("Meeting: {title}\n")
-        assert _load_template(vault, "meeting") == "Meeting: {title}\n"
+    def test_load_template_reads_file(self, vault_with_templates: Path) -> None:
+        assert _load_template(vault_with_templates, "meeting") == MEETING_TEMPLATE
 
     def test_render_template_replaces_variables(self) -> None:
         result = _render_template("Title: {title}, Date: {date}", title="My Note", date="2026-01-01")
@@ -123,29 +93,22 @@ class TestTemplates:
         result = _render_template("{title} and {unknown}", title="T")
         assert "{unknown}" in result
 
-    def test_create_note_uses_named_template(self, vault: Path) -> None:
-        (vault / "templates").mkdir(exist_ok=True)
-        (vault / "templates" / "meeting.md").write_text(
-            "---\ntitle: {title}\ndate: {date}\n---\n{tags}\n\n## Agenda\n\n{body}\n"
-        )
-        path = create_note("Stand-Up", "ideas", ["scrum"], "Daily sync.", vault, template="meeting")
-        content = (vault / path).read_text()
+    def test_create_note_uses_named_template(self, vault_with_templates: Path) -> None:
+        path = create_note("Stand-Up", "ideas", ["scrum"], "Daily sync.", vault_with_templates, template="meeting")
+        content = (vault_with_templates / path).read_text()
         assert "## Agenda" in content
         assert "Stand-Up" in content
         assert "#scrum" in content
 
-    def test_create_note_falls_back_to_directory_template(self, vault: Path) -> None:
-        (vault / "templates").mkdir(exist_ok=True)
-        (vault / "templates" / "ideas.md").write_text("---\ntitle: {title}\ndate: {date}\n---\nIdea: {body}\n")
-        path = create_note("Idea Note", "ideas", [], "cool idea", vault)
-        content = (vault / path).read_text()
+    def test_create_note_falls_back_to_directory_template(self, vault_with_templates: Path) -> None:
+        path = create_note("Idea Note", "ideas", [], "cool idea", vault_with_templates)
+        content = (vault_with_templates / path).read_text()
         assert "Idea: cool idea" in content
 
-    def test_create_note_falls_back_to_default_template(self, vault: Path) -> None:
-        (vault / "templates").mkdir(exist_ok=True)
-        (vault / "templates" / "default.md").write_text("---\ntitle: {title}\ndate: {date}\n---\nDefault: {body}\n")
-        path = create_note("Default Note", "projects", [], "body text", vault)
-        content = (vault / path).read_text()
+    def test_create_note_falls_back_to_default_template(self, vault_with_templates: Path) -> None:
+        # no projects.md template, so the default applies
+        path = create_note("Default Note", "projects", [], "body text", vault_with_templates)
+        content = (vault_with_templates / path).read_text()
         assert "Default: body text" in content
 
     def test_create_note_inline_fallback_when_no_templates(self, vault: Path) -> None:
@@ -207,19 +170,10 @@ class TestAppendToNote:
         content = (vault / "projects/second-brain.md").read_text()
         assert "New appended line." in content
 
-    def test_original_content_preserved(self, vault: Path) -> None:
-        original = (vault / "projects/second-brain.md").read_text()
+    def test_original_content_preserved(self, vault: Path, original_second_brain: str) -> None:
         append_to_note("projects/second-brain.md", "Appended.", vault)
         content = (vault / "projects/second-brain.md").read_text()
-        assert original in content
-
-    def test_missing_note_raises(self, vault: Path) -> None:
-        with pytest.raises(FileNotFoundError):
-            append_to_note("projects/ghost.md", "text", vault)
-
-    def test_path_traversal_rejected(self, vault: Path) -> None:
-        with pytest.raises(ValueError):
-            append_to_note("../../etc/passwd", "text", vault)
+        assert original_second_brain in content
 
     # --- section_header (R-WR-03) ---
 
@@ -227,11 +181,8 @@ class TestAppendToNote:
         # second-brain.md has a "## Notes" section
         append_to_note("projects/second-brain.md", "New section entry.", vault, section_header="Notes")
         content = (vault / "projects/second-brain.md").read_text()
-        lines = content.splitlines()
-        notes_idx = next(i for i, l in enumerate(lines) if l.strip() == "## Notes")
         # the appended text should appear after ## Notes, before the next ## header
-        rest = "\n".join(lines[notes_idx:])
-        assert "New section entry." in rest
+        assert content.index("\n## Notes\n") < content.index("New section entry.") < content.index("\n## Links\n")
 
     def test_section_header_missing_raises(self, vault: Path) -> None:
         with pytest.raises(ValueError, match="[Ss]ection"):
@@ -241,10 +192,7 @@ class TestAppendToNote:
         # Content after ## Notes should appear before ## Links
         append_to_note("projects/second-brain.md", "Inserted line.", vault, section_header="Notes")
         content = (vault / "projects/second-brain.md").read_text()
-        lines = content.splitlines()
-        inserted_idx = next(i for i, l in enumerate(lines) if "Inserted line." in l)
-        links_idx = next(i for i, l in enumerate(lines) if l.strip() == "## Links")
-        assert inserted_idx < links_idx
+        assert content.index("Inserted line.") < content.index("\n## Links\n")
 
     # --- dated (R-WR-03) ---
 
@@ -290,15 +238,27 @@ class TestUpdateTags:
         assert "#mcp" in content
 
     def test_remove_nonexistent_tag_is_noop(self, vault: Path) -> None:
-        before = (vault / "projects/second-brain.md").read_text()
+        note = vault / "projects/second-brain.md"
+        before = note.stat()
         update_tags("projects/second-brain.md", add=[], remove=["doesnotexist"], vault=vault)
-        after = (vault / "projects/second-brain.md").read_text()
-        assert before == after
+        after = note.stat()
+        # atomic_write swaps in a new inode, so an unchanged inode means no rewrite at all
+        assert (after.st_ino, after.st_size, after.st_mtime_ns) == (before.st_ino, before.st_size, before.st_mtime_ns)
+
 
-    def test_missing_note_raises(self, vault: Path) -> None:
+class TestInvalidTarget:
+    @pytest.mark.parametrize("fn,args", [
+        (append_to_note, ("projects/ghost.md", "text")),
+        (update_tags, ("projects/ghost.md", ["x"], [])),
+    ], ids=["append_to_note", "update_tags"])
+    def test_missing_note_raises(self, vault: Path, fn, args: tuple) -> None:
         with pytest.raises(FileNotFoundError):
-            update_tags("projects/ghost.md", add=["x"], remove=[], vault=vault)
+            fn(*args, vault)
 
-    def test_path_traversal_rejected(self, vault: Path) -> None:
+    @pytest.mark.parametrize("fn,args", [
+        (append_to_note, ("../../etc/passwd", "text")),
+        (update_tags, ("../../etc/passwd", [], [])),
+    ], ids=["append_to_note", "update_tags"])
+    def test_path_traversal_rejected(self, vault: Path, fn, args: tuple) -> None:
         with pytest.raises(ValueError):
-            update_tags("../../etc/passwd", add=[], remove=[], vault=vault)
+            fn(*args, vault)